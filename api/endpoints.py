@@ -1,18 +1,91 @@
+import importlib.util
+import json
 import os
 import tempfile
 import uuid
 import zipfile
+import zlib
+import anyio
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form
-from fastapi.responses import FileResponse
-from typing import Optional
+from fastapi.responses import FileResponse, JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Tuple
 
-from config import OCCT_AVAILABLE
-from services.step_processor import StepUnfoldGenerator
+# orjsonがあれば、SVG本文を含む大きなJSON応答の変換に使う
+# （ORJSONResponse自体はorjsonなしでもimportできるため、パッケージの有無で判定する）
+if importlib.util.find_spec("orjson") is not None:
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+else:
+    FastJSONResponse = JSONResponse
+
+from config import OCCT_AVAILABLE, MAX_DECOMPRESSED_UPLOAD_BYTES
+from services.step_processor import FACE_STAT_KEYS, StepUnfoldGenerator
 from models.request_models import BrepPapercraftRequest
 
 # APIルーターの作成
 router = APIRouter()
 
+# gzipストリームの先頭2バイト
+GZIP_MAGIC = b"\x1f\x8b"
+
+# SVGファイル応答の読み出し単位（既定の64KBより大きくし、大きな展開図での送信回数を減らす）
+SVG_RESPONSE_CHUNK_SIZE = 1 << 20
+
+# OCCTはInterface_Staticなどのプロセス共通状態を持ちスレッドセーフではないため、
+# STEP読み込み・展開は同時に1リクエストずつ実行する（gzip展開などOCCTを使わない処理は並行可）
+_OCCT_LIMITER = anyio.CapacityLimiter(1)
+
+def _decompress_gzip_upload(file_content: bytes) -> bytes:
+    """
+    gzip圧縮されたアップロードを展開する。
+    
+    Args:
+        file_content: gzip形式のバイト列
+    
+    Returns:
+        bytes: 展開後のバイト列
+    
+    Raises:
+        ValueError: gzipとして展開できない場合、または展開後サイズが上限を超える場合
+    """
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        content = decompressor.decompress(file_content, MAX_DECOMPRESSED_UPLOAD_BYTES)
+    except zlib.error as e:
+        raise ValueError(f"gzip圧縮ファイルの展開に失敗しました: {e}")
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"展開後のファイルサイズが上限（{MAX_DECOMPRESSED_UPLOAD_BYTES}バイト）を超えています。")
+    return content
+
+async def _read_step_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    アップロードされたSTEPファイルを検証して読み込む（gzip圧縮時は展開する）。
+    
+    Args:
+        file: アップロードファイル (.step/.stp、gzip圧縮可)
+    
+    Returns:
+        Tuple[bytes, str]: (ファイル内容, 拡張子 "step" または "stp")
+    
+    Raises:
+        HTTPException: STEP以外のファイルの場合
+        ValueError: gzipとして展開できない場合
+    """
+    # ファイル拡張子チェック（gzip圧縮時は.gzを除いた拡張子で判定）
+    filename = file.filename.lower()
+    if filename.endswith('.gz'):
+        filename = filename[:-3]
+    if not (filename.endswith('.step') or filename.endswith('.stp')):
+        raise HTTPException(status_code=400, detail="STEPファイル（.step/.stp）のみ対応です。")
+    file_content = await file.read()
+    
+    # テキストのSTEPはgzipで大きく縮むため、圧縮アップロードは内容の先頭で判別して展開
+    if file_content[:2] == GZIP_MAGIC:
+        file_content = await run_in_threadpool(_decompress_gzip_upload, file_content)
+    
+    file_ext = "step" if filename.endswith('.step') else "stp"
+    return file_content, file_ext
+
 # --- STEP専用APIエンドポイント ---
 @router.post("/api/step/unfold")
 async def unfold_step_to_svg(
@@ -22,19 +95,22 @@ async def unfold_step_to_svg(
     layout_mode: str = Form("canvas"),
     page_format: str = Form("A4"),
     page_orientation: str = Form("portrait"),
-    scale_factor: float = Form(10.0)
+    scale_factor: float = Form(10.0),
+    parallel_unfold: bool = Form(False)
 ):
     """
     STEPファイル（.step/.stp）を受け取り、展開図（SVG）を生成するAPI。
+    gzip圧縮したファイル（.step.gz/.stp.gz）も受け付ける。
     
     Args:
-        file: STEPファイル (.step/.stp)
+        file: STEPファイル (.step/.stp、gzip圧縮可)
         return_face_numbers: 面番号データを含むかどうか (default: True)
         output_format: 出力形式 - "svg"=SVGファイル、"json"=JSONレスポンス
         layout_mode: レイアウトモード - "canvas"=フリーキャンバス、"paged"=ページ分割 (default: "canvas")
         page_format: ページフォーマット - "A4", "A3", "Letter" (default: "A4")
         page_orientation: ページ方向 - "portrait"=縦、"landscape"=横 (default: "portrait")
         scale_factor: 図の縮尺倍率 (default: 10.0) - 例: 150なら1/150スケール
+        parallel_unfold: グループ数が多い場合に面グループをプロセス並列で展開するか (default: False)
     
     Returns:
         - output_format="svg": 単一SVGファイル（pagedモードでは全ページを縦に並べて表示）
@@ -43,17 +119,16 @@ async def unfold_step_to_svg(
     if not OCCT_AVAILABLE:
         raise HTTPException(status_code=503, detail="OpenCASCADE Technology が利用できません。STEPファイル処理に必要です。")
     try:
-        # ファイル拡張子チェック
-        if not (file.filename.lower().endswith('.step') or file.filename.lower().endswith('.stp')):
-            raise HTTPException(status_code=400, detail="STEPファイル（.step/.stp）のみ対応です。")
-        file_content = await file.read()
+        file_content, file_ext = await _read_step_upload(file)
         
         # StepUnfoldGeneratorインスタンスを作成
         step_unfold_generator = StepUnfoldGenerator()
         
         # STEPファイルの場合、load_from_bytesメソッドを使用し、拡張子を指定
-        file_ext = "step" if file.filename.lower().endswith('.step') else "stp"
-        if not step_unfold_generator.load_from_bytes(file_content, file_ext):
+        # OCCTによる読み込み・展開は同期処理のため、イベントループを塞がないようワーカースレッドで実行
+        if not await anyio.to_thread.run_sync(
+            step_unfold_generator.load_from_bytes, file_content, file_ext, limiter=_OCCT_LIMITER
+        ):
             raise HTTPException(status_code=400, detail="STEPファイルの読み込みに失敗しました。")
         output_path = os.path.join(tempfile.mkdtemp(), f"step_unfold_{uuid.uuid4()}.svg")
         
@@ -62,9 +137,13 @@ async def unfold_step_to_svg(
             layout_mode=layout_mode,
             page_format=page_format,
             page_orientation=page_orientation,
-            scale_factor=scale_factor
+            scale_factor=scale_factor,
+            parallel_unfold=parallel_unfold
+        )
+        svg_path, stats = await anyio.to_thread.run_sync(
+            step_unfold_generator.generate_brep_papercraft, request, output_path,
+            limiter=_OCCT_LIMITER
         )
-        svg_path, stats = step_unfold_generator.generate_brep_papercraft(request, output_path)
         
         # 出力形式に応じてレスポンスを分岐
         if output_format.lower() == "json":
@@ -87,11 +166,12 @@ async def unfold_step_to_svg(
                 face_numbers = step_unfold_generator.get_face_numbers()
                 response_data["face_numbers"] = face_numbers
             
-            return response_data
+            # 応答クラスを直接返し、jsonable_encoderによる全体の走査を省く
+            return FastJSONResponse(content=response_data)
         else:
             # SVGファイルレスポンス
             # ページモードでも単一ファイルに全ページが含まれる
-            return FileResponse(
+            response = FileResponse(
                 path=svg_path,
                 media_type="image/svg+xml",
                 filename=f"step_unfold_{layout_mode}_{uuid.uuid4()}.svg",
@@ -102,6 +182,8 @@ async def unfold_step_to_svg(
                     "X-Page-Count": str(stats.get("page_count", 1)) if layout_mode == "paged" else "1"
                 }
             )
+            response.chunk_size = SVG_RESPONSE_CHUNK_SIZE
+            return response
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -110,19 +192,61 @@ async def unfold_step_to_svg(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"予期しないエラー: {str(e)}")
 
+@router.post("/api/step/stats")
+async def step_face_stats(file: UploadFile = File(...)):
+    """
+    STEPファイル（.step/.stp）の面タイプ別の面数を返すAPI。
+    境界線のサンプリング・エッジ解析・展開は行わず、面の曲面タイプの分類のみ実行する。
+    
+    Args:
+        file: STEPファイル (.step/.stp、gzip圧縮可)
+    
+    Returns:
+        JSONレスポンス {"stats": 面タイプ別の面数}
+    """
+    if not OCCT_AVAILABLE:
+        raise HTTPException(status_code=503, detail="OpenCASCADE Technology が利用できません。STEPファイル処理に必要です。")
+    try:
+        file_content, file_ext = await _read_step_upload(file)
+        
+        step_unfold_generator = StepUnfoldGenerator()
+        if not await anyio.to_thread.run_sync(
+            step_unfold_generator.load_from_bytes, file_content, file_ext, limiter=_OCCT_LIMITER
+        ):
+            raise HTTPException(status_code=400, detail="STEPファイルの読み込みに失敗しました。")
+        
+        # 統計のみが必要なため、faces_data/edges_dataを作らない集計モードで解析
+        stats = await anyio.to_thread.run_sync(
+            step_unfold_generator.analyze_brep_topology, "stats_only", limiter=_OCCT_LIMITER
+        )
+        return FastJSONResponse(content={"stats": {key: stats[key] for key in FACE_STAT_KEYS}})
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"予期しないエラー: {str(e)}")
+
 # --- ヘルスチェック ---
+# 応答内容は起動時に決まるため、一度だけJSONに変換して使い回す
+_HEALTH_RESPONSE_BODY = json.dumps({
+    "status": "healthy" if OCCT_AVAILABLE else "degraded",
+    "version": "1.0.0",
+    "opencascade_available": OCCT_AVAILABLE,
+    "supported_formats": ["step", "stp", "brep"] if OCCT_AVAILABLE else [],
+    "features": {
+        "step_to_svg_unfold": OCCT_AVAILABLE,
+        "face_type_stats": OCCT_AVAILABLE,
+        "face_numbering": True,
+        "multi_page_layout": True,
+        "canvas_layout": True,
+        "paged_layout": True
+    }
+}, separators=(",", ":")).encode("utf-8")
+
 @router.get("/api/health", status_code=200)
 async def api_health_check():
-    return {
-        "status": "healthy" if OCCT_AVAILABLE else "degraded",
-        "version": "1.0.0",
-        "opencascade_available": OCCT_AVAILABLE,
-        "supported_formats": ["step", "stp", "brep"] if OCCT_AVAILABLE else [],
-        "features": {
-            "step_to_svg_unfold": OCCT_AVAILABLE,
-            "face_numbering": True,
-            "multi_page_layout": True,
-            "canvas_layout": True,
-            "paged_layout": True
-        }
-    }
+    return Response(content=_HEALTH_RESPONSE_BODY, media_type="application/json")
@@ -1,6 +1,7 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 # OpenCASCADE Technology (OCCT) の可用性チェック
 try:
@@ -35,6 +36,19 @@ except ImportError:
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3001")
 CORS_ALLOW_ALL = os.getenv("CORS_ALLOW_ALL", "false").lower() == "true"
 
+# 幾何解析結果キャッシュ（空の場合は実行ユーザー専用の ~/.cache/unfold-step2svg を使用）
+GEOMETRY_CACHE_DIR = os.getenv("GEOMETRY_CACHE_DIR", "")
+GEOMETRY_CACHE_MAX_ENTRIES = int(os.getenv("GEOMETRY_CACHE_MAX_ENTRIES", "64"))
+
+# 面グループ展開の並列化（既定は無効。ワーカー数1以下で無効、グループ数が閾値未満なら逐次処理）
+# spawnによるワーカー起動に1プロセスあたり約0.7秒かかり、1グループの展開は0.2ms前後のため、
+# 4ワーカーでも数千グループ未満では逐次処理の方が速い
+UNFOLD_MAX_WORKERS = int(os.getenv("UNFOLD_MAX_WORKERS", "1"))
+UNFOLD_PARALLEL_MIN_GROUPS = int(os.getenv("UNFOLD_PARALLEL_MIN_GROUPS", "6000"))
+
+# gzip圧縮されたSTEPアップロードの展開後サイズ上限（バイト）
+MAX_DECOMPRESSED_UPLOAD_BYTES = int(os.getenv("MAX_DECOMPRESSED_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+
 # アプリケーション設定
 APP_CONFIG = {
     "title": "unfold-step2svg",
@@ -87,8 +101,15 @@ def setup_cors(app: FastAPI) -> None:
         )
         print(f"CORS: 以下のオリジンを許可します: {origins}")
 
+def setup_compression(app: FastAPI) -> None:
+    """レスポンス圧縮設定を行う（SVG/JSONはテキストのため圧縮効果が大きい）"""
+    # Accept-Encoding: gzip を送るクライアントにのみ適用される
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+
 def create_app() -> FastAPI:
     """FastAPIアプリケーションを作成する"""
     app = FastAPI(**APP_CONFIG)
     setup_cors(app)
+    setup_compression(app)
     return app
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import shutil
 import tempfile
 import time
 import json
@@ -30,6 +31,15 @@ class FileLoader:
     def __init__(self):
         self.solid_shape = None
         self.last_file_info = None
+        
+        # 拡張子ごとの読み込み関数
+        self._loaders = {
+            "brep": self.load_brep_from_file,
+            "step": self.load_step_from_file,
+            "stp": self.load_step_from_file,
+            "iges": self.load_iges_from_file,
+            "igs": self.load_iges_from_file,
+        }
     
     def load_brep_from_file(self, file_path: str) -> bool:
         """
@@ -277,14 +287,10 @@ class FileLoader:
         file_ext = os.path.splitext(file_path)[1].lower().lstrip('.')
         
         # 拡張子に応じた処理
-        if file_ext in ['brep']:
-            return self.load_brep_from_file(file_path)
-        elif file_ext in ['step', 'stp']:
-            return self.load_step_from_file(file_path)
-        elif file_ext in ['iges', 'igs']:
-            return self.load_iges_from_file(file_path)
-        else:
+        loader = self._loaders.get(file_ext)
+        if loader is None:
             raise ValueError(f"未対応ファイル形式: .{file_ext}")
+        return loader(file_path)
 
     def diagnose_file(self, file_path: str, save_debug_copy: bool = True) -> dict:
         """
@@ -300,14 +306,15 @@ class FileLoader:
         }
         
         try:
-            # ファイル存在確認
-            if not os.path.exists(file_path):
+            # ファイル存在確認と基本情報取得（statは1回のみ）
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
                 result["error"] = f"ファイルが存在しません: {file_path}"
                 return result
-                
-            # 基本情報取得
+            
             result["exists"] = True
-            result["size"] = os.path.getsize(file_path)
+            result["size"] = file_stat.st_size
             
             # ファイルヘッダー（先頭100バイト）取得
             try:
@@ -325,17 +332,15 @@ class FileLoader:
                     debug_dir = os.path.join(os.path.dirname(__file__), "debug_files")
                     
                     # ディレクトリがなければ作成
-                    if not os.path.exists(debug_dir):
-                        os.makedirs(debug_dir)
+                    os.makedirs(debug_dir, exist_ok=True)
                         
                     # タイムスタンプ付きでファイルをコピー
                     timestamp = time.strftime("%Y%m%d-%H%M%S")
                     debug_filename = f"debug_{timestamp}_{os.path.basename(file_path)}"
                     debug_path = os.path.join(debug_dir, debug_filename)
                     
-                    # ファイルをコピー
-                    with open(file_path, 'rb') as src, open(debug_path, 'wb') as dst:
-                        dst.write(src.read())
+                    # ファイルをコピー（全体をメモリに読み込まず、OSのコピー機構を使う）
+                    shutil.copyfile(file_path, debug_path)
                         
                     result["saved_path"] = debug_path
                     print(f"デバッグ用にファイルをコピーしました: {debug_path}")
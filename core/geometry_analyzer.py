@@ -6,17 +6,30 @@ BREP形状の幾何学解析を行うクラス。
 import math
 import numpy as np
 from typing import List, Dict, Tuple, Optional
-from scipy.spatial import ConvexHull
 
 from config import OCCT_AVAILABLE
 
 if OCCT_AVAILABLE:
-    from OCC.Core.TopExp import TopExp_Explorer
-    from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX, TopAbs_WIRE
+    from OCC.Core.TopExp import TopExp_Explorer, topexp
+    from OCC.Core.TopTools import (
+        TopTools_IndexedMapOfShape, TopTools_IndexedDataMapOfShapeListOfShape,
+        TopTools_ListIteratorOfListOfShape
+    )
+    from OCC.Core.TopoDS import topods
+    from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_EDGE, TopAbs_WIRE, TopAbs_REVERSED
     from OCC.Core.BRepAdaptor import BRepAdaptor_Surface, BRepAdaptor_Curve
     from OCC.Core.GeomAbs import GeomAbs_Plane, GeomAbs_Cylinder, GeomAbs_Cone, GeomAbs_Sphere
-    from OCC.Core.gp import gp_Pnt, gp_Vec
-    from OCC.Core.Geom import Geom_Surface, Geom_Plane, Geom_CylindricalSurface, Geom_ConicalSurface
+    from OCC.Core.gp import gp_Pnt
+
+
+# 面タイプ文字列と整数コードの対応（face_arrays["surface_type"]で使用）
+SURFACE_TYPE_CODES = {
+    "plane": 0,
+    "cylinder": 1,
+    "cone": 2,
+    "sphere": 3,
+    "other": 4,
+}
 
 
 class GeometryAnalyzer:
@@ -28,6 +41,16 @@ class GeometryAnalyzer:
     def __init__(self):
         self.faces_data: List[Dict] = []
         self.edges_data: List[Dict] = []
+        # 面属性の配列表現（属性ごとの連続配列。一括演算用）
+        self.face_arrays: Dict[str, np.ndarray] = build_face_arrays([])
+        # エッジ→隣接面の配列表現（face_a/face_bはfaces_data内の位置、なければ-1）
+        self.edge_arrays: Dict[str, np.ndarray] = build_edge_arrays([])
+        # エッジのサンプリング結果キャッシュ（隣接面で共有されるエッジを1回だけ評価する）
+        # hash(edge) -> [(edge, サンプル数, 点列), ...]
+        self._edge_sample_cache: Dict[int, List[Tuple]] = {}
+        # 直近の解析で収集した面・エッジの索引付きマップ（インデックスは1始まり）
+        self.face_map = None
+        self.edge_map = None
         # 各方向の面のカウンター（ユニークな番号を割り当てるため）
         self.face_direction_counters = {
             'pos_z': 0,  # +Z方向
@@ -61,56 +84,85 @@ class GeometryAnalyzer:
         }
         print("面番号カウンターをリセットしました")
     
-    def analyze_brep_topology(self, solid_shape):
+    def analyze_brep_topology(self, solid_shape, mode: str = "full") -> Dict:
         """
         BREPソリッドのトポロジ構造を詳細解析。
         面・エッジ・頂点の幾何特性を抽出し、展開戦略を決定。
+        
+        Args:
+            solid_shape: 解析対象の形状
+            mode: "full"（面・エッジを詳細解析）または
+                  "stats_only"（面タイプの集計のみ。faces_data/edges_dataは更新しない）
+        
+        Returns:
+            Dict: 更新後の統計情報（どちらのモードでも同じ形式）
         """
         if solid_shape is None:
             raise ValueError("BREPデータが読み込まれていません")
         
+        if mode == "stats_only":
+            return self._count_surface_types(solid_shape)
+        if mode != "full":
+            raise ValueError(f"未対応の解析モード: {mode}")
+        
         print("BREPトポロジ解析開始...")
-        self.faces_data.clear()
-        self.edges_data.clear()
+        # 既存リストをclear()せず新しいリストを構築して差し替える。
+        # 以前の解析結果を参照している側（キャッシュ等）を破壊しないため。
+        faces_data: List[Dict] = []
+        edges_data: List[Dict] = []
+        self._edge_sample_cache = {}
         self.reset_face_numbering()  # 面番号カウンターをリセット
         
         try:
-            # --- 面（Face）の解析 ---
-            face_explorer = TopExp_Explorer(solid_shape, TopAbs_FACE)
-            face_index = 0
+            # 面・エッジを一度ずつ索引付きマップに収集（共有エッジは1回だけ登録される）
+            # エッジはそれを含む面（祖先）のリストと合わせて収集する
+            face_map = TopTools_IndexedMapOfShape()
+            edge_map = TopTools_IndexedDataMapOfShapeListOfShape()
+            topexp.MapShapes(solid_shape, TopAbs_FACE, face_map)
+            topexp.MapShapesAndAncestors(solid_shape, TopAbs_EDGE, TopAbs_FACE, edge_map)
             
-            while face_explorer.More():
-                face = face_explorer.Current()
+            # 面マップのインデックス → faces_data内の位置（解析に失敗した面は含まれない）
+            face_positions: Dict[int, int] = {}
+            
+            # --- 面（Face）の解析 ---
+            for face_index in range(face_map.Size()):
+                face = topods.Face(face_map.FindKey(face_index + 1))
                 print(f"面 {face_index} を解析中...")
                 face_data = self._analyze_face_geometry(face, face_index)
                 if face_data:
-                    self.faces_data.append(face_data)
+                    face_positions[face_index] = len(faces_data)
+                    faces_data.append(face_data)
                     print(f"面 {face_index} 解析完了: {face_data['surface_type']}, 面積: {face_data['area']:.2f}")
-                face_index += 1
-                face_explorer.Next()
             
             # --- エッジ（Edge）の解析 ---
-            edge_explorer = TopExp_Explorer(solid_shape, TopAbs_EDGE)
-            edge_index = 0
-            
-            while edge_explorer.More():
-                edge = edge_explorer.Current()
+            for edge_index in range(edge_map.Size()):
+                edge = topods.Edge(edge_map.FindKey(edge_index + 1))
                 print(f"エッジ {edge_index} を解析中...")
                 edge_data = self._analyze_edge_geometry(edge, edge_index)
                 if edge_data:
-                    self.edges_data.append(edge_data)
-                edge_index += 1
-                edge_explorer.Next()
+                    edge_data["adjacent_faces"] = self._collect_adjacent_faces(
+                        edge_map.FindFromIndex(edge_index + 1), face_map, face_positions
+                    )
+                    edge_data["is_boundary"] = len(edge_data["adjacent_faces"]) < 2
+                    edges_data.append(edge_data)
+            
+            # 後続処理（エッジ→隣接面の対応付け等）で再利用する
+            self.face_map = face_map
+            self.edge_map = edge_map
+            
+            self.faces_data = faces_data
+            self.edges_data = edges_data
+            self.face_arrays = build_face_arrays(faces_data)
+            self.edge_arrays = build_edge_arrays(edges_data)
+            # OCCTオブジェクトへの参照を解放
+            self._edge_sample_cache = {}
             
             # --- 統計情報更新 ---
-            self.stats["total_faces"] = len(self.faces_data)
-            self.stats["planar_faces"] = sum(1 for f in self.faces_data if f["surface_type"] == "plane")
-            self.stats["cylindrical_faces"] = sum(1 for f in self.faces_data if f["surface_type"] == "cylinder")
-            self.stats["conical_faces"] = sum(1 for f in self.faces_data if f["surface_type"] == "cone")
-            self.stats["other_faces"] = sum(1 for f in self.faces_data if f["surface_type"] == "other")
+            self._update_type_stats(self.face_arrays["surface_type"])
             
             print(f"トポロジ解析完了: {self.stats['total_faces']} 面, {len(self.edges_data)} エッジ")
             print(f"面の内訳: 平面={self.stats['planar_faces']}, 円筒={self.stats['cylindrical_faces']}, 円錐={self.stats['conical_faces']}, その他={self.stats['other_faces']}")
+            return self.stats
             
         except Exception as e:
             print(f"トポロジ解析エラー: {e}")
@@ -118,6 +170,67 @@ class GeometryAnalyzer:
             traceback.print_exc()
             raise ValueError(f"BREPトポロジ解析エラー: {str(e)}")
 
+    def _collect_adjacent_faces(self, ancestor_faces, face_map, face_positions: Dict[int, int]) -> List[int]:
+        """
+        エッジの祖先面リストをfaces_data内の位置に変換。
+        
+        Args:
+            ancestor_faces: MapShapesAndAncestorsで得たTopTools_ListOfShape
+            face_map: 面の索引付きマップ
+            face_positions: 面マップのインデックス（0始まり）→ faces_data内の位置
+        
+        Returns:
+            List[int]: 隣接面の位置（重複なし）
+        """
+        adjacent = []
+        it = TopTools_ListIteratorOfListOfShape(ancestor_faces)
+        while it.More():
+            position = face_positions.get(face_map.FindIndex(it.Value()) - 1)
+            if position is not None and position not in adjacent:
+                adjacent.append(position)
+            it.Next()
+        return adjacent
+
+    def _count_surface_types(self, solid_shape) -> Dict:
+        """
+        面の曲面タイプのみを集計して統計情報を更新（境界線・エッジ解析は行わない）。
+        
+        Args:
+            solid_shape: 解析対象の形状
+        
+        Returns:
+            Dict: 更新後の統計情報
+        """
+        try:
+            face_map = TopTools_IndexedMapOfShape()
+            topexp.MapShapes(solid_shape, TopAbs_FACE, face_map)
+            
+            type_codes = np.empty(face_map.Size(), dtype=np.int8)
+            for i in range(face_map.Size()):
+                face = topods.Face(face_map.FindKey(i + 1))
+                type_name = self._get_surface_type_name(BRepAdaptor_Surface(face).GetType())
+                type_codes[i] = SURFACE_TYPE_CODES[type_name]
+        except Exception as e:
+            raise ValueError(f"BREPトポロジ解析エラー: {str(e)}")
+        
+        self._update_type_stats(type_codes)
+        print(f"面タイプ集計完了: {self.stats['total_faces']} 面")
+        return self.stats
+    
+    def _update_type_stats(self, type_codes: np.ndarray):
+        """
+        面タイプコードの配列から面数の統計情報を更新。
+        
+        Args:
+            type_codes: 面ごとのSURFACE_TYPE_CODES値
+        """
+        type_counts = np.bincount(type_codes, minlength=len(SURFACE_TYPE_CODES))
+        self.stats["total_faces"] = int(len(type_codes))
+        self.stats["planar_faces"] = int(type_counts[SURFACE_TYPE_CODES["plane"]])
+        self.stats["cylindrical_faces"] = int(type_counts[SURFACE_TYPE_CODES["cylinder"]])
+        self.stats["conical_faces"] = int(type_counts[SURFACE_TYPE_CODES["cone"]])
+        self.stats["other_faces"] = int(type_counts[SURFACE_TYPE_CODES["other"]])
+
     def _analyze_face_geometry(self, face, face_index: int):
         """
         個別面の幾何特性を詳細解析。
@@ -165,6 +278,8 @@ class GeometryAnalyzer:
                 "centroid": [centroid.X(), centroid.Y(), centroid.Z()],
                 "surface_type": self._get_surface_type_name(surface_type_enum),
                 "normal_vector": normal_vec,  # 法線ベクトルを保存
+                # 面の向きが曲面と逆（外向き法線はnormal_vectorの反対向き）
+                "reversed": face.Orientation() == TopAbs_REVERSED,
                 "unfoldable": True,  # デフォルトで展開可能とする
                 "boundary_curves": []
             }
@@ -191,6 +306,12 @@ class GeometryAnalyzer:
                 print(f"面{face_index}: 境界線が取得できませんが、展開可能として処理")
                 # 立方体の場合の簡易境界線を生成
                 face_data["boundary_curves"] = self._generate_default_square_boundary()
+            
+            # 展開処理で点ごとの配列変換を避けるため、連続したfloat64配列も保持
+            face_data["boundary_curves_np"] = [
+                np.ascontiguousarray(boundary, dtype=np.float64).reshape(-1, 3)
+                for boundary in face_data["boundary_curves"]
+            ]
                 
             return face_data
             
@@ -456,6 +577,14 @@ class GeometryAnalyzer:
         """
         3D空間でのエッジサンプリング（フォールバック）。
         """
+        # 同一エッジ（向き違いを含む）は共有面・エッジ解析で再評価しない。
+        # BRepAdaptor_Curveはエッジの向きに依存しないため点列はそのまま再利用できる。
+        edge_key = hash(edge)
+        cached_entries = self._edge_sample_cache.setdefault(edge_key, [])
+        for cached_edge, cached_samples, cached_points in cached_entries:
+            if cached_samples == num_samples and cached_edge.IsSame(edge):
+                return list(cached_points)
+        
         points = []
         
         try:
@@ -470,8 +599,10 @@ class GeometryAnalyzer:
                 
         except Exception as e:
             print(f"3Dエッジサンプリングエラー: {e}")
-            
-        return points
+            return points
+        
+        cached_entries.append((edge, num_samples, points))
+        return list(points)
 
     def _extract_wire_points_fallback(self, wire, num_points: int = 50) -> List[Tuple[float, float, float]]:
         """
@@ -502,39 +633,23 @@ class GeometryAnalyzer:
         エッジの幾何特性解析（隣接面・タイプ・長さ等）
         """
         try:
-            # エッジの長さ計算（代替方法）
-            curve_adaptor = BRepAdaptor_Curve(edge)
-            u_min = curve_adaptor.FirstParameter()
-            u_max = curve_adaptor.LastParameter()
-            
-            # 簡易長さ計算
+            # 面の境界抽出時と同じ10分割のサンプル点を再利用して長さ・中点を求める
             num_samples = 10
-            total_length = 0.0
-            prev_point = None
+            samples = self._sample_edge_points_3d(edge, num_samples)
+            if len(samples) != num_samples + 1:
+                raise ValueError("エッジのサンプリングに失敗しました")
             
-            for i in range(num_samples + 1):
-                u = u_min + (u_max - u_min) * i / num_samples
-                current_point = curve_adaptor.Value(u)
-                
-                if prev_point is not None:
-                    dx = current_point.X() - prev_point.X()
-                    dy = current_point.Y() - prev_point.Y()
-                    dz = current_point.Z() - prev_point.Z()
-                    segment_length = (dx*dx + dy*dy + dz*dz)**0.5
-                    total_length += segment_length
-                    
-                prev_point = current_point
-            
-            length = total_length
+            # 簡易長さ計算（折れ線長）
+            sample_array = np.asarray(samples, dtype=np.float64)
+            length = float(np.linalg.norm(np.diff(sample_array, axis=0), axis=1).sum())
             
-            # 中点取得
-            u_mid = (u_min + u_max) / 2
-            midpoint = curve_adaptor.Value(u_mid)
+            # 中点取得（パラメータ範囲の中央）
+            midpoint = samples[num_samples // 2]
             
             return {
                 "index": edge_index,
                 "length": length,
-                "midpoint": [midpoint.X(), midpoint.Y(), midpoint.Z()],
+                "midpoint": list(midpoint),
                 "adjacent_faces": [],  # 後で隣接面情報を追加
                 "is_boundary": False   # 境界エッジかどうか
             }
@@ -574,22 +689,96 @@ class GeometryAnalyzer:
             return points_2d
         
         cleaned_points = [points_2d[0]]
+        tolerance_sq = tolerance * tolerance
         
         for i in range(1, len(points_2d)):
             current = points_2d[i]
             last = cleaned_points[-1]
             
-            # 距離チェック
-            distance = math.sqrt((current[0] - last[0])**2 + (current[1] - last[1])**2)
-            if distance > tolerance:
+            # 距離チェック（二乗距離で比較）
+            dx = current[0] - last[0]
+            dy = current[1] - last[1]
+            if dx * dx + dy * dy > tolerance_sq:
                 cleaned_points.append(current)
         
         # 最初と最後の点が重複している場合は除去
         if len(cleaned_points) > 2:
             first = cleaned_points[0]
             last = cleaned_points[-1]
-            distance = math.sqrt((first[0] - last[0])**2 + (first[1] - last[1])**2)
-            if distance <= tolerance:
+            dx = first[0] - last[0]
+            dy = first[1] - last[1]
+            if dx * dx + dy * dy <= tolerance_sq:
                 cleaned_points = cleaned_points[:-1]
         
-        return cleaned_points
\ No newline at end of file
+        return cleaned_points
+
+
+def build_face_arrays(faces_data: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    面データのリストから属性ごとのNumPy配列を構築。
+    
+    Args:
+        faces_data: 面データのリスト
+    
+    Returns:
+        Dict[str, np.ndarray]: 属性名をキーとする配列の辞書
+            centroids (N,3) float64, normals (N,3) float64（法線がない面はNaN）,
+            surface_type (N,) int8, area (N,) float64,
+            radius (N,) float64（円筒・円錐以外はNaN）, unfoldable (N,) bool,
+            reversed (N,) bool（面の向きが曲面と逆で、外向き法線がnormalsの反対向き）
+    """
+    n = len(faces_data)
+    centroids = np.zeros((n, 3), dtype=np.float64)
+    normals = np.full((n, 3), np.nan, dtype=np.float64)
+    surface_type = np.full(n, SURFACE_TYPE_CODES["other"], dtype=np.int8)
+    area = np.zeros(n, dtype=np.float64)
+    radius = np.full(n, np.nan, dtype=np.float64)
+    unfoldable = np.zeros(n, dtype=bool)
+    reversed_ = np.zeros(n, dtype=bool)
+    
+    for i, face in enumerate(faces_data):
+        centroids[i] = face["centroid"]
+        normal = face.get("plane_normal") or face.get("normal_vector")
+        if normal is not None:
+            normals[i] = normal
+        surface_type[i] = SURFACE_TYPE_CODES.get(face["surface_type"], SURFACE_TYPE_CODES["other"])
+        area[i] = face.get("area", 0.0)
+        face_radius = face.get("cylinder_radius", face.get("cone_radius"))
+        if face_radius is not None:
+            radius[i] = face_radius
+        unfoldable[i] = face.get("unfoldable", False)
+        reversed_[i] = face.get("reversed", False)
+    
+    return {
+        "centroids": centroids,
+        "normals": normals,
+        "surface_type": surface_type,
+        "area": area,
+        "radius": radius,
+        "unfoldable": unfoldable,
+        "reversed": reversed_,
+    }
+
+
+def build_edge_arrays(edges_data: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    エッジデータのリストから隣接面インデックスの配列を構築。
+    
+    Args:
+        edges_data: エッジデータのリスト
+    
+    Returns:
+        Dict[str, np.ndarray]: face_a, face_b (E,) int32（隣接面がない場合は-1）
+    """
+    n = len(edges_data)
+    face_a = np.full(n, -1, dtype=np.int32)
+    face_b = np.full(n, -1, dtype=np.int32)
+    
+    for i, edge in enumerate(edges_data):
+        adjacent = edge.get("adjacent_faces", [])
+        if len(adjacent) >= 1:
+            face_a[i] = adjacent[0]
+        if len(adjacent) >= 2:
+            face_b[i] = adjacent[1]
+    
+    return {"face_a": face_a, "face_b": face_b}
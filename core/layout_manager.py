@@ -10,12 +10,17 @@ It provides functionality for:
 """
 
 from typing import List, Dict, Tuple, Optional
+import numpy as np
 try:
+    import shapely
     from shapely.geometry import Polygon
     from shapely.ops import unary_union
     SHAPELY_AVAILABLE = True
+    # Shapely 2.0以降はポリゴン配列の一括生成・一括判定が使える
+    SHAPELY_VECTORIZED = hasattr(shapely, "polygons")
 except ImportError:
     SHAPELY_AVAILABLE = False
+    SHAPELY_VECTORIZED = False
     print("Warning: Shapely not available. Using bounding box overlap detection only.")
 
 
@@ -81,7 +86,10 @@ class LayoutManager:
         
         # 重複回避配置アルゴリズム
         placed_groups = []
-        occupied_areas = []  # 既に使用されている領域（bbox用）
+        # 既に使用されている領域（bbox用、[min_x, min_y, max_x, max_y]の行）。
+        # グループ数分を確保し、先頭occupied_count行を使用中とする
+        occupied_areas = np.empty((len(unfolded_groups), 4))
+        occupied_count = 0
         placed_polygon_groups = []  # 配置済みポリゴンデータ（ポリゴン重複検出用）
         margin_mm = 8  # 十分な間隔で線の重複を回避
         
@@ -90,7 +98,7 @@ class LayoutManager:
             
             # 最適な配置位置を探索（bbox判定とポリゴン判定の両方を使用）
             position = self._find_non_overlapping_position_with_polygons(
-                group, bbox, occupied_areas, placed_polygon_groups, margin_mm
+                group, bbox, occupied_areas[:occupied_count], placed_polygon_groups, margin_mm
             )
             
             # グループを配置
@@ -99,18 +107,14 @@ class LayoutManager:
             
             positioned_group = self._translate_group(group, offset_x, offset_y)
             positioned_group["position"] = position
+            positioned_group["placed_bounds"] = self._placed_bounds(group, bbox, offset_x, offset_y)
             
             placed_groups.append(positioned_group)
             placed_polygon_groups.append(positioned_group)  # ポリゴンデータも保存
             
             # 占有エリアを記録（マージン込み）
-            occupied_area = {
-                "min_x": position["x"] - margin_mm,
-                "min_y": position["y"] - margin_mm, 
-                "max_x": position["x"] + bbox["width"] + margin_mm,
-                "max_y": position["y"] + bbox["height"] + margin_mm
-            }
-            occupied_areas.append(occupied_area)
+            occupied_areas[occupied_count] = self._occupied_rect(position, bbox, margin_mm)
+            occupied_count += 1
             
             print(f"グループ配置: ({position['x']:.1f}, {position['y']:.1f}) サイズ: {bbox['width']:.1f}x{bbox['height']:.1f}mm")
         
@@ -129,18 +133,15 @@ class LayoutManager:
         if not polygons:
             return {"min_x": 0, "min_y": 0, "max_x": 0, "max_y": 0, "width": 0, "height": 0}
         
-        all_points = []
-        for polygon in polygons:
-            all_points.extend(polygon)
+        # 座標の型（展開結果のfloat32等）はそのまま使い、最小・最大値のみPythonのfloatにする
+        point_arrays = [np.asarray(polygon).reshape(-1, 2) for polygon in polygons]
+        all_points = np.concatenate(point_arrays) if point_arrays else np.empty((0, 2))
         
-        if not all_points:
+        if len(all_points) == 0:
             return {"min_x": 0, "min_y": 0, "max_x": 0, "max_y": 0, "width": 0, "height": 0}
         
-        xs = [p[0] for p in all_points]
-        ys = [p[1] for p in all_points]
-        
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
+        min_x, min_y = (float(v) for v in all_points.min(axis=0))
+        max_x, max_y = (float(v) for v in all_points.max(axis=0))
         
         return {
             "min_x": min_x,
@@ -151,6 +152,27 @@ class LayoutManager:
             "height": max_y - min_y
         }
     
+    def _placed_bounds(self, group: Dict, bbox: Dict, offset_x: float,
+                       offset_y: float) -> Tuple[float, float, float, float]:
+        """
+        配置後のグループ全体（ポリゴン・タブ）の範囲を、移動前の境界ボックスをずらして求める。
+        
+        Args:
+            group: 移動前のグループ
+            bbox: 移動前のポリゴンの境界ボックス
+            offset_x: X方向移動量
+            offset_y: Y方向移動量
+        
+        Returns:
+            (min_x, min_y, max_x, max_y)
+        """
+        min_x, min_y, max_x, max_y = bbox["min_x"], bbox["min_y"], bbox["max_x"], bbox["max_y"]
+        if len(group.get("tabs", [])) > 0:
+            tab_bbox = self._calculate_group_bbox(group["tabs"])
+            min_x, min_y = min(min_x, tab_bbox["min_x"]), min(min_y, tab_bbox["min_y"])
+            max_x, max_y = max(max_x, tab_bbox["max_x"]), max(max_y, tab_bbox["max_y"])
+        return (min_x + offset_x, min_y + offset_y, max_x + offset_x, max_y + offset_y)
+    
     def _translate_group(self, group: Dict, offset_x: float, offset_y: float) -> Dict:
         """
         グループ全体を指定オフセットで移動
@@ -164,29 +186,47 @@ class LayoutManager:
             移動後のグループ
         """
         translated_group = group.copy()
+        offset = np.array([offset_x, offset_y], dtype=np.float64)
         
-        # ポリゴン移動
-        translated_polygons = []
-        for polygon in group["polygons"]:
-            translated_polygon = [(x + offset_x, y + offset_y) for x, y in polygon]
-            translated_polygons.append(translated_polygon)
-        translated_group["polygons"] = translated_polygons
-        
-        # タブ移動
-        translated_tabs = []
-        for tab in group.get("tabs", []):
-            translated_tab = [(x + offset_x, y + offset_y) for x, y in tab]
-            translated_tabs.append(translated_tab)
-        translated_group["tabs"] = translated_tabs
+        # ポリゴン・タブ移動
+        translated_group["polygons"] = self._transform_shapes(group["polygons"], offset)
+        translated_group["tabs"] = self._transform_shapes(group.get("tabs", []), offset)
         
         return translated_group
     
-    def _create_shapely_polygon(self, polygon_points: List[Tuple[float, float]]) -> Optional['Polygon']:
+    def _transform_shapes(self, shapes: List, offset: np.ndarray, scale: float = 1.0) -> List[np.ndarray]:
+        """
+        複数の点列を1つの(ΣNi, 2)配列に連結して一括で拡大縮小・平行移動し、元の単位に分割して返す。
+        
+        Args:
+            shapes: 点列（タプルのリストまたは(N, 2)配列）のリスト
+            offset: (2,)の移動量
+            scale: 倍率（移動の前に適用）
+        
+        Returns:
+            List[np.ndarray]: 移動後の(Ni, 2)配列のリスト（連結配列のビュー）。
+                展開エンジン由来のfloat32座標はfloat32のまま扱う
+        """
+        if not shapes:
+            return []
+        
+        point_arrays = [np.asarray(shape).reshape(-1, 2) for shape in shapes]
+        stacked = np.concatenate(point_arrays)
+        if not np.issubdtype(stacked.dtype, np.floating):
+            stacked = stacked.astype(np.float64)
+        if scale != 1.0:
+            stacked *= stacked.dtype.type(scale)
+        stacked += offset.astype(stacked.dtype)
+        
+        splits = np.cumsum([len(points) for points in point_arrays[:-1]], dtype=np.intp)
+        return np.split(stacked, splits)
+    
+    def _create_shapely_polygon(self, polygon_points) -> Optional['Polygon']:
         """
         Shapelyポリゴンオブジェクトを作成
         
         Args:
-            polygon_points: ポリゴンの頂点リスト
+            polygon_points: ポリゴンの頂点（タプルのリストまたは(N, 2)配列）
         
         Returns:
             Shapelyポリゴンオブジェクト、または作成できない場合None
@@ -196,9 +236,10 @@ class LayoutManager:
         
         try:
             # 閉じたポリゴンにする（最初と最後の点が異なる場合）
-            if polygon_points[0] != polygon_points[-1]:
-                polygon_points = polygon_points + [polygon_points[0]]
-            return Polygon(polygon_points)
+            points = np.asarray(polygon_points, dtype=np.float64).reshape(-1, 2)
+            if not np.array_equal(points[0], points[-1]):
+                points = np.vstack((points, points[:1]))
+            return Polygon(points)
         except Exception as e:
             print(f"ポリゴン作成エラー: {e}")
             return None
@@ -222,35 +263,110 @@ class LayoutManager:
         if not SHAPELY_AVAILABLE:
             return False  # Shapelyが利用できない場合はbbox判定に依存
         
-        # 各グループのポリゴンを移動してShapelyオブジェクトに変換
-        shapely_polys1 = []
-        for poly in polygons1:
-            moved_poly = [(x + offset1[0], y + offset1[1]) for x, y in poly]
-            shapely_poly = self._create_shapely_polygon(moved_poly)
-            if shapely_poly:
-                shapely_polys1.append(shapely_poly)
-        
-        shapely_polys2 = []
-        for poly in polygons2:
-            moved_poly = [(x + offset2[0], y + offset2[1]) for x, y in poly]
-            shapely_poly = self._create_shapely_polygon(moved_poly)
-            if shapely_poly:
-                shapely_polys2.append(shapely_poly)
-        
-        # 各ポリゴンペアで交差チェック
-        for poly1 in shapely_polys1:
-            for poly2 in shapely_polys2:
-                if poly1.intersects(poly2):
-                    # 接触のみか重なりかを確認
-                    intersection = poly1.intersection(poly2)
-                    # 面積のある交差（重なり）か、完全包含をチェック
-                    if intersection.area > 1e-6 or poly1.contains(poly2) or poly2.contains(poly1):
-                        return True
+        # 各グループのポリゴンを一括で移動（Shapelyで扱えない3点未満の形状は除く）
+        moved1 = [poly for poly in self._transform_shapes(polygons1, np.asarray(offset1, dtype=np.float64))
+                  if len(poly) >= 3]
+        moved2 = [poly for poly in self._transform_shapes(polygons2, np.asarray(offset2, dtype=np.float64))
+                  if len(poly) >= 3]
+        if not moved1 or not moved2:
+            return False
+        
+        # 全ポリゴンペアのbbox交差を一括判定し、bboxが離れているペアはShapelyに渡さない
+        bounds1 = self._shape_bounds(moved1)
+        bounds2 = self._shape_bounds(moved2)
+        candidates = (
+            (bounds1[:, None, 0] <= bounds2[None, :, 2]) & (bounds2[None, :, 0] <= bounds1[:, None, 2]) &
+            (bounds1[:, None, 1] <= bounds2[None, :, 3]) & (bounds2[None, :, 1] <= bounds1[:, None, 3])
+        )
+        if not candidates.any():
+            return False
+        
+        if SHAPELY_VECTORIZED:
+            return self._candidate_pairs_overlap(moved1, moved2, candidates)
+        
+        # 候補ペアに含まれるポリゴンだけをShapelyオブジェクトに変換
+        shapely_polys1 = {}
+        shapely_polys2 = {}
+        for i, j in zip(*np.nonzero(candidates)):
+            if i not in shapely_polys1:
+                shapely_polys1[i] = self._create_shapely_polygon(moved1[i])
+            if j not in shapely_polys2:
+                shapely_polys2[j] = self._create_shapely_polygon(moved2[j])
+            poly1, poly2 = shapely_polys1[i], shapely_polys2[j]
+            if poly1 is None or poly2 is None:
+                continue
+            
+            if poly1.intersects(poly2):
+                # 接触のみか重なりかを確認
+                intersection = poly1.intersection(poly2)
+                # 面積のある交差（重なり）か、完全包含をチェック
+                if intersection.area > 1e-6 or poly1.contains(poly2) or poly2.contains(poly1):
+                    return True
         
         return False
     
+    def _candidate_pairs_overlap(self, moved1: List[np.ndarray], moved2: List[np.ndarray],
+                                 candidates: np.ndarray) -> bool:
+        """
+        Shapely 2.0のベクトル化APIで、bboxが交差するポリゴンペアの重なりを一括判定。
+        
+        Args:
+            moved1: 最初のグループの移動済みポリゴン
+            moved2: 2番目のグループの移動済みポリゴン
+            candidates: (M1, M2)のbbox交差ペアのマスク
+        
+        Returns:
+            重複する場合True
+        """
+        rows, cols = np.nonzero(candidates)
+        geoms1 = self._build_shapely_polygons(moved1)[rows]
+        geoms2 = self._build_shapely_polygons(moved2)[cols]
+        
+        touching = shapely.intersects(geoms1, geoms2)
+        if not touching.any():
+            return False
+        geoms1 = geoms1[touching]
+        geoms2 = geoms2[touching]
+        
+        # 接触のみは除き、面積のある交差（重なり）か完全包含を重複とみなす
+        overlapping = (
+            (shapely.area(shapely.intersection(geoms1, geoms2)) > 1e-6)
+            | shapely.contains(geoms1, geoms2)
+            | shapely.contains(geoms2, geoms1)
+        )
+        return bool(overlapping.any())
+    
+    def _build_shapely_polygons(self, shapes: List[np.ndarray]) -> np.ndarray:
+        """
+        点列のリストを連結配列とリング番号から一括でShapelyポリゴン配列に変換。
+        リングは自動的に閉じられる。
+        
+        Args:
+            shapes: 3点以上の(Ni, 2)配列のリスト
+        
+        Returns:
+            np.ndarray: Shapelyポリゴンのオブジェクト配列
+        """
+        coords = np.concatenate(shapes).astype(np.float64, copy=False)
+        ring_ids = np.repeat(np.arange(len(shapes)), [len(shape) for shape in shapes])
+        return shapely.polygons(shapely.linearrings(coords, indices=ring_ids))
+    
+    def _shape_bounds(self, shapes: List[np.ndarray]) -> np.ndarray:
+        """
+        点列ごとの境界ボックスを連結配列上の区間reduceで一括計算。
+        
+        Args:
+            shapes: 空でない(Ni, 2)配列のリスト
+        
+        Returns:
+            np.ndarray: (M, 4)の[min_x, min_y, max_x, max_y]配列
+        """
+        stacked = np.concatenate(shapes)
+        starts = np.concatenate(([0], np.cumsum([len(shape) for shape in shapes[:-1]]))).astype(np.intp)
+        return np.hstack((np.minimum.reduceat(stacked, starts), np.maximum.reduceat(stacked, starts)))
+    
     def _find_non_overlapping_position_with_polygons(
-        self, group: Dict, bbox: Dict, occupied_areas: List[Dict], 
+        self, group: Dict, bbox: Dict, occupied_areas: np.ndarray, 
         placed_polygon_groups: List[Dict], margin_mm: float
     ) -> Dict:
         """
@@ -259,7 +375,7 @@ class LayoutManager:
         Args:
             group: 配置するグループ（ポリゴンデータ含む）
             bbox: 配置するグループの境界ボックス
-            occupied_areas: 既に占有されている領域のリスト（bbox用）
+            occupied_areas: 既に占有されている領域の(M, 4)配列（bbox用）
             placed_polygon_groups: 配置済みのポリゴングループ
             margin_mm: 必要なマージン
         
@@ -271,19 +387,11 @@ class LayoutManager:
         max_x = 300  # 最大探索範囲
         max_y = 400
         
+        x_candidates = np.arange(0, max_x, grid_step)
+        
         for y in range(0, max_y, grid_step):
-            for x in range(0, max_x, grid_step):
-                candidate_area = {
-                    "min_x": x,
-                    "min_y": y,
-                    "max_x": x + bbox["width"],
-                    "max_y": y + bbox["height"]
-                }
-                
-                # まずbboxレベルで重複チェック（高速）
-                if self._areas_overlap(candidate_area, occupied_areas):
-                    continue
-                
+            # まずbboxレベルで行全体を一括チェック（高速）
+            for x in self._free_positions_in_row(x_candidates, y, bbox, occupied_areas):
                 # bboxが重複しない場合、ポリゴンレベルでチェック（精密）
                 candidate_offset = (x - bbox["min_x"], y - bbox["min_y"])
                 overlap_found = False
@@ -302,9 +410,8 @@ class LayoutManager:
                 if not overlap_found:
                     return {"x": x, "y": y}
         
-        # 重複しない位置が見つからない場合は右端に配置
-        rightmost_x = max([area["max_x"] for area in occupied_areas], default=0)
-        return {"x": rightmost_x + margin_mm, "y": 0}
+        # 探索範囲内に空きがない場合は探索幅の帯の中で最も低い位置に積む
+        return self._skyline_position(bbox, occupied_areas, max_x)
     
     def _find_non_overlapping_position(self, bbox: Dict, occupied_areas: List[Dict], margin_mm: float) -> Dict:
         """
@@ -323,42 +430,124 @@ class LayoutManager:
         max_x = 300  # 最大探索範囲
         max_y = 400
         
+        x_candidates = np.arange(0, max_x, grid_step)
+        
         for y in range(0, max_y, grid_step):
-            for x in range(0, max_x, grid_step):
-                candidate_area = {
-                    "min_x": x,
-                    "min_y": y,
-                    "max_x": x + bbox["width"],
-                    "max_y": y + bbox["height"]
-                }
-                
-                # 既存エリアとの重複チェック
-                if not self._areas_overlap(candidate_area, occupied_areas):
-                    return {"x": x, "y": y}
+            # 既存エリアとの重複チェック（行単位で一括）
+            free_x = self._free_positions_in_row(x_candidates, y, bbox, occupied_areas)
+            if free_x:
+                return {"x": free_x[0], "y": y}
+        
+        # 探索範囲内に空きがない場合は探索幅の帯の中で最も低い位置に積む
+        return self._skyline_position(bbox, occupied_areas, max_x)
+    
+    def _occupied_rect(self, position: Dict, bbox: Dict, margin: float) -> np.ndarray:
+        """
+        配置済みグループの占有矩形（マージン込み）を[min_x, min_y, max_x, max_y]で返す。
+        """
+        return np.array([
+            position["x"] - margin,
+            position["y"] - margin,
+            position["x"] + bbox["width"] + margin,
+            position["y"] + bbox["height"] + margin
+        ])
+    
+    def _as_rect_array(self, occupied_areas) -> np.ndarray:
+        """
+        占有エリアを(M, 4)配列に変換（辞書のリストも受け付ける）。
+        """
+        if isinstance(occupied_areas, np.ndarray):
+            return occupied_areas
+        return np.array(
+            [[a["min_x"], a["min_y"], a["max_x"], a["max_y"]] for a in occupied_areas],
+            dtype=np.float64
+        ).reshape(-1, 4)
+    
+    def _skyline_position(self, bbox: Dict, occupied_areas, strip_width: float) -> Dict:
+        """
+        幅strip_widthの帯の中で、占有エリアの上端（スカイライン）に載せたときに
+        最も低くなる位置を求める。右方向へ際限なく伸びる配置を避け、キャンバスを小さく保つ。
+        
+        Args:
+            bbox: 配置するグループの境界ボックス
+            occupied_areas: 既存の占有エリア（(M, 4)配列または辞書のリスト、マージン込み）
+            strip_width: 帯の幅
+        
+        Returns:
+            配置位置 {"x": float, "y": float}
+        """
+        rects = self._as_rect_array(occupied_areas)
+        if len(rects) == 0:
+            return {"x": 0, "y": 0}
+        
+        # 候補X座標は左端と各占有エリアの右端（帯に収まるもののみ）
+        x_candidates = np.unique(np.concatenate(([0.0], rects[:, 2])))
+        x_candidates = x_candidates[x_candidates >= 0]
+        fits = x_candidates + bbox["width"] <= strip_width
+        if fits.any():
+            x_candidates = x_candidates[fits]
+        else:
+            x_candidates = x_candidates[:1]
         
-        # 重複しない位置が見つからない場合は右端に配置
-        rightmost_x = max([area["max_x"] for area in occupied_areas], default=0)
-        return {"x": rightmost_x + margin_mm, "y": 0}
+        # 各候補の幅に掛かる占有エリアのうち最も高い上端が配置Y座標
+        spans = ~((x_candidates[:, None] + bbox["width"] <= rects[None, :, 0]) |
+                  (x_candidates[:, None] >= rects[None, :, 2]))
+        tops = np.where(spans, rects[None, :, 3], 0.0).max(axis=1)
+        tops = np.maximum(tops, 0.0)
+        
+        best = int(np.argmin(tops))
+        return {"x": float(x_candidates[best]), "y": float(tops[best])}
     
-    def _areas_overlap(self, candidate: Dict, occupied_areas: List[Dict]) -> bool:
+    def _free_positions_in_row(self, x_candidates: np.ndarray, y: float, bbox: Dict,
+                               occupied_areas) -> List:
+        """
+        1行分の候補X座標のうち、占有エリアと重複しないものを一括で求める。
+        
+        Args:
+            x_candidates: 候補X座標の配列
+            y: 行のY座標
+            bbox: 配置するグループの境界ボックス
+            occupied_areas: 既存の占有エリア（(M, 4)配列または辞書のリスト）
+        
+        Returns:
+            List: 重複しない候補X座標（昇順）
+        """
+        rects = self._as_rect_array(occupied_areas)
+        if len(rects) == 0:
+            return x_candidates.tolist()
+        
+        # Y方向で重ならない占有エリアは行全体に影響しないため除外
+        row_rects = rects[~((y + bbox["height"] <= rects[:, 1]) | (y >= rects[:, 3]))]
+        if len(row_rects) == 0:
+            return x_candidates.tolist()
+        
+        # (候補数, 占有エリア数)でX方向の重複を判定
+        cand_min_x = x_candidates[:, None]
+        cand_max_x = cand_min_x + bbox["width"]
+        overlaps = ~((cand_max_x <= row_rects[None, :, 0]) | (cand_min_x >= row_rects[None, :, 2]))
+        return x_candidates[~overlaps.any(axis=1)].tolist()
+    
+    def _areas_overlap(self, candidate: Dict, occupied_areas) -> bool:
         """
         候補エリアが既存の占有エリアと重複するかチェック。
         
         Args:
             candidate: 候補エリア
-            occupied_areas: 既存の占有エリアリスト
+            occupied_areas: 既存の占有エリア（(M, 4)配列または辞書のリスト）
         
         Returns:
             重複する場合True
         """
-        for occupied in occupied_areas:
-            # 矩形の重複判定
-            if not (candidate["max_x"] <= occupied["min_x"] or 
-                   candidate["min_x"] >= occupied["max_x"] or
-                   candidate["max_y"] <= occupied["min_y"] or 
-                   candidate["min_y"] >= occupied["max_y"]):
-                return True
-        return False
+        rects = self._as_rect_array(occupied_areas)
+        if len(rects) == 0:
+            return False
+        
+        # 全占有矩形との重複判定を一括で行う
+        separated = ((candidate["max_x"] <= rects[:, 0]) |
+                     (candidate["min_x"] >= rects[:, 2]) |
+                     (candidate["max_y"] <= rects[:, 1]) |
+                     (candidate["min_y"] >= rects[:, 3]))
+        return not separated.all()
     
     def calculate_overall_bbox(self, placed_groups: List[Dict]) -> Dict:
         """
@@ -373,30 +562,27 @@ class LayoutManager:
         if not placed_groups:
             return {"min_x": 0, "min_y": 0, "max_x": 0, "max_y": 0, "width": 0, "height": 0}
         
-        all_points = []
-        for group in placed_groups:
-            for polygon in group["polygons"]:
-                all_points.extend(polygon)
-            for tab in group.get("tabs", []):
-                all_points.extend(tab)
-        
-        if not all_points:
-            return {"min_x": 0, "min_y": 0, "max_x": 0, "max_y": 0, "width": 0, "height": 0}
-        
-        xs = [p[0] for p in all_points]
-        ys = [p[1] for p in all_points]
+        # 配置時に記録した各グループの範囲があれば、頂点を走査せずに合成する
+        if all("placed_bounds" in group for group in placed_groups):
+            bounds = np.array([group["placed_bounds"] for group in placed_groups], dtype=np.float64)
+            min_x, min_y = bounds[:, :2].min(axis=0).tolist()
+            max_x, max_y = bounds[:, 2:].max(axis=0).tolist()
+            return {
+                "min_x": min_x,
+                "min_y": min_y,
+                "max_x": max_x,
+                "max_y": max_y,
+                "width": max_x - min_x,
+                "height": max_y - min_y
+            }
         
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
+        # 全グループのポリゴン・タブを1つの点集合として境界ボックスを計算
+        all_shapes = []
+        for group in placed_groups:
+            all_shapes.extend(group["polygons"])
+            all_shapes.extend(group.get("tabs", []))
         
-        return {
-            "min_x": min_x,
-            "min_y": min_y,
-            "max_x": max_x,
-            "max_y": max_y,
-            "width": max_x - min_x,
-            "height": max_y - min_y
-        }
+        return self._calculate_group_bbox(all_shapes)
     
     def _calculate_page_dimensions(self):
         """
@@ -447,17 +633,9 @@ class LayoutManager:
                 scale = min(scale_x, scale_y) * 0.9  # 90%のサイズに縮小してマージンを確保
                 
                 # グループをスケールダウン
-                scaled_polygons = []
-                for polygon in group["polygons"]:
-                    scaled_polygon = [(x * scale, y * scale) for x, y in polygon]
-                    scaled_polygons.append(scaled_polygon)
-                group["polygons"] = scaled_polygons
-                
-                scaled_tabs = []
-                for tab in group.get("tabs", []):
-                    scaled_tab = [(x * scale, y * scale) for x, y in tab]
-                    scaled_tabs.append(scaled_tab)
-                group["tabs"] = scaled_tabs
+                no_offset = np.zeros(2)
+                group["polygons"] = self._transform_shapes(group["polygons"], no_offset, scale)
+                group["tabs"] = self._transform_shapes(group.get("tabs", []), no_offset, scale)
                 
                 # 境界ボックスを再計算
                 bbox = self._calculate_group_bbox(group["polygons"])
@@ -470,7 +648,9 @@ class LayoutManager:
         # ページ単位で配置
         paged_groups = []
         current_page = []
-        page_occupied_areas = []
+        # ページ内の占有領域（1ページに載るのは最大でも全グループ数。先頭page_occupied_count行を使用）
+        page_occupied_areas = np.empty((len(unfolded_groups), 4))
+        page_occupied_count = 0
         margin_mm = 5  # ページ内のアイテム間マージン
         
         for group in unfolded_groups:
@@ -478,7 +658,7 @@ class LayoutManager:
             
             # 現在のページに配置を試みる
             position = self._find_position_in_page(
-                bbox, page_occupied_areas, 
+                bbox, page_occupied_areas[:page_occupied_count], 
                 self.printable_width_mm, self.printable_height_mm, margin_mm
             )
             
@@ -487,7 +667,7 @@ class LayoutManager:
                 if current_page:
                     paged_groups.append(current_page)
                     current_page = []
-                    page_occupied_areas = []
+                    page_occupied_count = 0
                 
                 # 新しいページの最初に配置
                 position = {"x": 0, "y": 0}
@@ -501,13 +681,8 @@ class LayoutManager:
             current_page.append(positioned_group)
             
             # 占有エリアを記録
-            occupied_area = {
-                "min_x": position["x"] - margin_mm,
-                "min_y": position["y"] - margin_mm,
-                "max_x": position["x"] + bbox["width"] + margin_mm,
-                "max_y": position["y"] + bbox["height"] + margin_mm
-            }
-            page_occupied_areas.append(occupied_area)
+            page_occupied_areas[page_occupied_count] = self._occupied_rect(position, bbox, margin_mm)
+            page_occupied_count += 1
         
         # 最後のページを追加
         if current_page:
@@ -535,18 +710,13 @@ class LayoutManager:
         # グリッドベースで位置を探索
         grid_step = 5  # 5mm刻み
         
+        x_candidates = np.arange(0, int(max_width - bbox["width"]), grid_step)
+        
         for y in range(0, int(max_height - bbox["height"]), grid_step):
-            for x in range(0, int(max_width - bbox["width"]), grid_step):
-                candidate_area = {
-                    "min_x": x,
-                    "min_y": y,
-                    "max_x": x + bbox["width"],
-                    "max_y": y + bbox["height"]
-                }
-                
-                # 既存エリアとの重複チェック
-                if not self._areas_overlap(candidate_area, occupied_areas):
-                    return {"x": x, "y": y}
+            # 既存エリアとの重複チェック（行単位で一括）
+            free_x = self._free_positions_in_row(x_candidates, y, bbox, occupied_areas)
+            if free_x:
+                return {"x": free_x[0], "y": y}
         
         return None  # 配置可能な位置が見つからない
 
@@ -568,8 +738,13 @@ class LayoutManager:
             page_format: ページフォーマット
             page_orientation: ページ方向
         """
-        if page_format is not None:
+        page_changed = False
+        if page_format is not None and page_format != self.page_format:
             self.page_format = page_format
-        if page_orientation is not None:
+            page_changed = True
+        if page_orientation is not None and page_orientation != self.page_orientation:
             self.page_orientation = page_orientation
-        self._calculate_page_dimensions()
\ No newline at end of file
+            page_changed = True
+        # 同一設定の再送時はページ寸法の再計算を省略
+        if page_changed:
+            self._calculate_page_dimensions()
\ No newline at end of file
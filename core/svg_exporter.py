@@ -1,9 +1,69 @@
+import logging
 import os
 import tempfile
+from string import Template
 import uuid
-from typing import List, Dict, Optional
+from xml.sax.saxutils import escape
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 import svgwrite
 
+logger = logging.getLogger(__name__)
+
+
+def format_path_data(shapes: List[np.ndarray]) -> bytes:
+    """
+    複数の(N, 2)座標配列を1つのSVGパスのd属性値（"M x,y L x,y ... Z M ..."）に変換。
+    頂点ごとにformatを呼ぶ代わりに、全形状分の書式文字列へ一度に%展開する。
+    
+    Args:
+        shapes: 2点以上の頂点配列のリスト
+    
+    Returns:
+        bytes: ASCIIエンコードされたパスデータ
+    """
+    if not shapes:
+        return b""
+    template = " ".join("M%.3f,%.3f L" + "%.3f,%.3f " * (len(shape) - 1) + "Z" for shape in shapes)
+    coords = np.concatenate(shapes).ravel().tolist()
+    return (template % tuple(coords)).encode("ascii")
+
+
+# 面ポリゴン・タブを直接書き出す位置を示すプレースホルダ要素のクラス名
+GROUP_CONTENT_CLASS = "unfold-content"
+
+# 直接書き出す面ポリゴン・タブ・面番号の固定部分（出力のたびに組み立てない）
+_FACE_PATH_PREFIX = b'<path class="face-polygon" d="'
+_TAB_PATH_PREFIX = b'<path class="tab-polygon" d="'
+_FACE_NUMBER_TEMPLATE = (
+    '<text dominant-baseline="middle" style="font-family: Arial, sans-serif; font-size: %spx; '
+    'font-weight: bold; fill: #ff0000; text-anchor: middle;" x="%.3f" y="%.3f">%s</text>'
+)
+
+# キャンバス出力の商用グレードスタイル定義
+_CANVAS_STYLE = """
+            .face-polygon { fill: none; stroke: #000000; stroke-width: 2; }
+            .tab-polygon { fill: none; stroke: #0066cc; stroke-width: 1.5; stroke-dasharray: 4,4; }
+            .fold-line { stroke: #ff6600; stroke-width: 1; stroke-dasharray: 6,6; }
+            .cut-line { stroke: #ff0000; stroke-width: 0.8; stroke-dasharray: 3,3; }
+            .title-text { font-family: Arial, sans-serif; font-size: 24px; font-weight: bold; fill: #000000; }
+            .scale-text { font-family: Arial, sans-serif; font-size: 16px; fill: #000000; }
+            .note-text { font-family: Arial, sans-serif; font-size: 14px; fill: #666666; }
+            .face-number { font-family: Arial, sans-serif; font-size: 140px; font-weight: bold; fill: #ff0000; text-anchor: middle; }
+        """
+
+# キャンバス出力のタイトル・スケールバー・注記のテンプレート（出力ごとに座標のみ差し替える）
+_TITLE_TEMPLATE = '<text class="title-text" text-anchor="middle" x="{x}" y="{y}">{title}</text>'
+
+_SCALE_BAR_TEMPLATE = (
+    '<line stroke="black" stroke-width="2" x1="{x0}" x2="{x1}" y1="{y}" y2="{y}" />'
+    '<line stroke="black" stroke-width="1.5" x1="{x0}" x2="{x0}" y1="{tick_top}" y2="{tick_bottom}" />'
+    '<line stroke="black" stroke-width="1.5" x1="{x1}" x2="{x1}" y1="{tick_top}" y2="{tick_bottom}" />'
+    '<text class="scale-text" text-anchor="middle" x="{label_x}" y="{label_y}">{label}</text>'
+)
+
+_TECHNICAL_NOTES = ("切り取り線 (Cut Lines)", "━━━ 実線で切断")
+
 
 class SVGExporter:
     """
@@ -11,6 +71,9 @@ class SVGExporter:
     展開図のSVG形式での出力機能を提供。
     """
     
+    # キャンバス出力の外枠（svg要素・スタイル定義・描画位置）。サイズ以外は毎回同じため初回に生成して使い回す
+    _canvas_prelude: Optional[Template] = None
+    
     def __init__(self, scale_factor: float = 10.0, units: str = "mm", 
                  tab_width: float = 5.0, show_scale: bool = True,
                  show_fold_lines: bool = True, show_cut_lines: bool = True,
@@ -80,143 +143,230 @@ class SVGExporter:
             overall_bbox = self._calculate_overall_bbox(placed_groups)
         
         print(f"ページフォーマット: {self.page_format}")
-        print(f"全体境界ボックス: {overall_bbox}")
+        logger.debug("全体境界ボックス: %s", overall_bbox)
         
+        # 描画倍率・SVGサイズ・オフセット等の寸法を一度だけ計算
+        canvas = self._compute_canvas_layout(overall_bbox)
+        print(f"縮尺: 1/{self.scale_factor:.0f} (描画倍率: {canvas['actual_scale']:.2f})")
+        print(f"動的SVGサイズ: {canvas['svg_width']:.1f} x {canvas['svg_height']:.1f} px")
+        
+        # SVG作成 (内容に合わせたサイズ)
+        svg_text = self._get_canvas_prelude().substitute(width=canvas["svg_width"], height=canvas["svg_height"])
+        
+        # タイトル描画 (ページ上部中央)
+        title = f"Diorama-CAD(mitou-jr) - {len(placed_groups)} Groups"
+        annotations = _TITLE_TEMPLATE.format(x=canvas["svg_width"] / 2, y=40, title=escape(title))
+        
+        # スケールバー描画
+        annotations += self._scale_bar_markup(canvas)
+        
+        # 注記追加
+        annotations += self._technical_notes_markup(canvas)
+        
+        # SVG保存
+        polygon_count = self._save_with_group_elements(
+            svg_text, output_path,
+            [(placed_groups, canvas["actual_scale"], canvas["content_offset_x"], canvas["content_offset_y"])],
+            trailer=annotations
+        )
+        
+        print(f"SVG描画完了: {polygon_count}個のポリゴンを描画")
+        return output_path
+    
+    def _compute_canvas_layout(self, overall_bbox: Dict) -> Dict:
+        """
+        キャンバス出力の寸法（描画倍率・SVGサイズ・内容のオフセット・スケールバー長）を計算。
+        
+        Args:
+            overall_bbox: 全体境界ボックス
+        
+        Returns:
+            Dict: 出力中に参照する寸法
+        """
         # scale_factorはAPIから渡される値を使用（自動調整しない）
         # scale_factor=150なら1/150スケール → 実際の描画倍率は基準倍率/scale_factor
         # 基準倍率を10とし、scale_factorで割る
         base_scale = 10.0  # 基準描画倍率
         actual_scale = base_scale / self.scale_factor if self.scale_factor > 0 else base_scale
-        print(f"縮尺: 1/{self.scale_factor:.0f} (描画倍率: {actual_scale:.2f})")
-        
-        # SVGサイズを内容に合わせて動的調整
-        scaled_content_width = overall_bbox["width"] * actual_scale
-        scaled_content_height = overall_bbox["height"] * actual_scale
         
-        # 十分な余白を確保
+        # 十分な余白を確保し、SVGサイズを内容に合わせて動的調整
         margin = 50
-        svg_width = scaled_content_width + 2 * margin
-        svg_height = scaled_content_height + 2 * margin + 100  # タイトル・スケール用
+        svg_width = overall_bbox["width"] * actual_scale + 2 * margin
+        svg_height = overall_bbox["height"] * actual_scale + 2 * margin + 100  # タイトル・スケール用
         
-        # 最小サイズを保証
-        svg_width = max(svg_width, 600)
-        svg_height = max(svg_height, 400)
+        # スケールバー仕様
+        bar_length_mm = 50.0  # 50mm (5cm)
         
-        print(f"動的SVGサイズ: {svg_width:.1f} x {svg_height:.1f} px")
+        return {
+            "actual_scale": actual_scale,
+            # 最小サイズを保証
+            "svg_width": max(svg_width, 600),
+            "svg_height": max(svg_height, 400),
+            # メインコンテンツを適切にオフセット（タイトル分下げる）
+            "content_offset_x": margin - overall_bbox["min_x"] * actual_scale,
+            "content_offset_y": margin + 60 - overall_bbox["min_y"] * actual_scale,
+            "bar_length_mm": bar_length_mm,
+            "bar_length_px": bar_length_mm * actual_scale / 10,  # スケールに合わせて調整
+        }
+    
+    @classmethod
+    def _get_canvas_prelude(cls) -> Template:
+        """
+        キャンバス出力の外枠（svg要素・スタイル定義・面ポリゴンの描画位置）のテンプレートを取得。
+        svgwriteでの生成は初回のみ行い、以降は幅・高さの差し替えだけで使い回す。
         
-        # SVG作成 (内容に合わせたサイズ)
-        dwg = svgwrite.Drawing(
-            output_path, 
-            size=(f"{svg_width}px", f"{svg_height}px"), 
-            viewBox=f"0 0 {svg_width} {svg_height}"
-        )
+        Returns:
+            Template: $width・$heightを置換するSVG文字列のテンプレート
+        """
+        if cls._canvas_prelude is None:
+            # 寸法は置換用の変数名のまま出力するため、属性値の検証は行わない
+            dwg = svgwrite.Drawing(
+                size=("${width}px", "${height}px"),
+                viewBox="0 0 $width $height",
+                debug=False
+            )
+            
+            # 商用グレードスタイル定義
+            dwg.defs.add(dwg.style(_CANVAS_STYLE))
+            
+            # 面ポリゴン・タブの描画位置（従来通りタイトル等の背面）
+            dwg.add(dwg.g(class_=GROUP_CONTENT_CLASS))
+            cls._canvas_prelude = Template(dwg.tostring())
+        return cls._canvas_prelude
+    
+    def _save_with_group_elements(self, svg_text: str, output_path: str, group_batches: List[Tuple],
+                                  trailer: str = "") -> int:
+        """
+        外枠のSVG文字列を保存し、プレースホルダ要素の位置に面ポリゴン・タブを
+        svgwriteの要素ツリーを経由せず直接書き出す。
         
-        # 商用グレードスタイル定義
-        dwg.defs.add(dwg.style("""
-            .face-polygon { fill: none; stroke: #000000; stroke-width: 2; }
-            .tab-polygon { fill: none; stroke: #0066cc; stroke-width: 1.5; stroke-dasharray: 4,4; }
-            .fold-line { stroke: #ff6600; stroke-width: 1; stroke-dasharray: 6,6; }
-            .cut-line { stroke: #ff0000; stroke-width: 0.8; stroke-dasharray: 3,3; }
-            .title-text { font-family: Arial, sans-serif; font-size: 24px; font-weight: bold; fill: #000000; }
-            .scale-text { font-family: Arial, sans-serif; font-size: 16px; fill: #000000; }
-            .note-text { font-family: Arial, sans-serif; font-size: 14px; fill: #666666; }
-            .face-number { font-family: Arial, sans-serif; font-size: 140px; font-weight: bold; fill: #ff0000; text-anchor: middle; }
-        """))
+        Args:
+            svg_text: GROUP_CONTENT_CLASSのプレースホルダを含むSVG文字列
+            output_path: 出力パス
+            group_batches: プレースホルダごとの(グループリスト, 倍率, Xオフセット, Yオフセット)（文書順）
+            trailer: 最後のグループの直後に書き出す生のSVG要素（タイトル・注記等）
         
-        # メインコンテンツを適切にオフセット
-        content_offset_x = margin - overall_bbox["min_x"] * actual_scale
-        content_offset_y = margin + 60 - overall_bbox["min_y"] * actual_scale  # タイトル分下げる
+        Returns:
+            int: 書き出した面ポリゴン数
+        """
+        placeholder = f'<g class="{GROUP_CONTENT_CLASS}" />'
+        parts = svg_text.split(placeholder)
+        if len(parts) != len(group_batches) + 1:
+            raise ValueError("プレースホルダ要素の数が描画対象と一致しません")
         
         polygon_count = 0
+        with open(output_path, "wb", buffering=1 << 20) as f:
+            f.write(b'<?xml version="1.0" encoding="utf-8" ?>\n')
+            f.write(parts[0].encode("utf-8"))
+            last_batch = len(group_batches) - 1
+            for batch_idx, ((groups, scale, offset_x, offset_y), part) in enumerate(zip(group_batches, parts[1:])):
+                f.write(f'<g class="{GROUP_CONTENT_CLASS}">'.encode("ascii"))
+                polygon_count += self._write_group_elements(f, groups, scale, offset_x, offset_y)
+                f.write(b"</g>")
+                if batch_idx == last_batch:
+                    f.write(trailer.encode("utf-8"))
+                f.write(part.encode("utf-8"))
+        return polygon_count
+    
+    def _write_group_elements(self, f, placed_groups: List[Dict], scale: float,
+                              offset_x: float, offset_y: float) -> int:
+        """
+        配置済みグループの面ポリゴン・面番号・タブをSVG要素としてファイルに書き出す。
         
-        for group_idx, group in enumerate(placed_groups):
-            print(f"グループ{group_idx}をSVGに描画中...")
-            print(f"  ポリゴン数: {len(group['polygons'])}")
-            
-            # 面ポリゴン描画
-            for poly_idx, polygon in enumerate(group["polygons"]):
-                if len(polygon) >= 3:
-                    # スケールファクターを適用
-                    points = [(x * actual_scale + content_offset_x, y * actual_scale + content_offset_y) for x, y in polygon]
-                    dwg.add(dwg.polygon(points=points, class_="face-polygon"))
-                    polygon_count += 1
-                    print(f"  ポリゴン{poly_idx}: {len(polygon)}点を描画")
-                    
-                    # 面番号を描画（ポリゴンの中心に配置）
-                    print(f"  グループデータ: face_numbers={group.get('face_numbers', 'なし')}")
-                    if "face_numbers" in group and poly_idx < len(group["face_numbers"]):
-                        # ポリゴンの中心を計算
-                        center_x = sum(p[0] for p in points) / len(points)
-                        center_y = sum(p[1] for p in points) / len(points)
-                        
-                        # 面のサイズに基づいてフォントサイズを計算
-                        font_size = self._calculate_face_number_size(points)
-                        
-                        # 面番号テキストを追加（動的サイズで）
-                        face_number = group["face_numbers"][poly_idx]
-                        dwg.add(dwg.text(
-                            str(face_number),
-                            insert=(center_x, center_y),
-                            style=f"font-family: Arial, sans-serif; font-size: {font_size}px; font-weight: bold; fill: #ff0000; text-anchor: middle;",
-                            dominant_baseline="middle"  # 垂直中央揃え
-                        ))
-                        print(f"    面番号{face_number}を中心({center_x:.1f}, {center_y:.1f})にサイズ{font_size:.1f}pxで描画")
-                    else:
-                        print(f"    面番号なし: poly_idx={poly_idx}, face_numbers存在={('face_numbers' in group)}")
-                else:
-                    print(f"  ポリゴン{poly_idx}: 点数不足({len(polygon)}点)")
-            
-            # タブ描画
-            for tab_idx, tab in enumerate(group.get("tabs", [])):
-                if len(tab) >= 3:
-                    # スケールファクターを適用
-                    points = [(x * actual_scale + content_offset_x, y * actual_scale + content_offset_y) for x, y in tab]
-                    dwg.add(dwg.polygon(points=points, class_="tab-polygon"))
-                    print(f"  タブ{tab_idx}: {len(tab)}点を描画")
+        Args:
+            f: バイナリモードで開いた出力ファイル
+            placed_groups: 配置済みのグループデータ
+            scale: 描画倍率
+            offset_x: X方向オフセット
+            offset_y: Y方向オフセット
         
-        print(f"SVG描画完了: {polygon_count}個のポリゴンを描画")
+        Returns:
+            int: 書き出した面ポリゴン数
+        """
+        face_shapes = []
+        tab_shapes = []
+        face_number_elements = []
+        skipped_count = 0
         
-        # タイトル描画 (ページ上部中央)
-        title = f"Diorama-CAD(mitou-jr) - {len(placed_groups)} Groups"
-        title_x = svg_width / 2
-        title_y = 40
-        dwg.add(dwg.text(title, insert=(title_x, title_y), text_anchor="middle", class_="title-text"))
+        for group in placed_groups:
+            face_numbers = group.get("face_numbers", [])
+            
+            # グループ内の全頂点にスケールとオフセットを一括適用
+            polygons_px, tabs_px = self._transform_group_shapes(group, scale, offset_x, offset_y)
+            
+            # 3点未満の退化形状はグループ単位で一括して除外する
+            valid_polygons = self._valid_shape_indices(polygons_px)
+            valid_tabs = self._valid_shape_indices(tabs_px)
+            skipped_count += len(polygons_px) - len(valid_polygons)
+            
+            # 面ポリゴン・タブは種類ごとに1つのパスへまとめ、面番号のみ個別に出力する
+            face_shapes.extend(polygons_px[poly_idx] for poly_idx in valid_polygons)
+            tab_shapes.extend(tabs_px[tab_idx] for tab_idx in valid_tabs)
+            
+            for poly_idx in valid_polygons:
+                # 面番号を描画（ポリゴンの中心に配置）
+                if poly_idx < len(face_numbers):
+                    points = polygons_px[poly_idx]
+                    center_x, center_y = points.mean(axis=0).tolist()
+                    
+                    # 面のサイズに基づいてフォントサイズを計算
+                    font_size = self._calculate_face_number_size(points)
+                    
+                    face_number_elements.append(_FACE_NUMBER_TEMPLATE % (
+                        font_size, center_x, center_y, escape(str(face_numbers[poly_idx]))
+                    ))
+        
+        self._write_path_element(f, face_shapes, _FACE_PATH_PREFIX)
+        self._write_path_element(f, tab_shapes, _TAB_PATH_PREFIX)
+        f.write("".join(face_number_elements).encode("utf-8"))
+        
+        # 要素ごとの出力は行わず、件数の要約のみを記録する
+        logger.debug("%dグループを書き出し: 面ポリゴン%d個, タブ%d個, 点数不足でスキップ%d個",
+                     len(placed_groups), len(face_shapes), len(tab_shapes), skipped_count)
+        return len(face_shapes)
+    
+    @staticmethod
+    def _valid_shape_indices(shapes: List[np.ndarray]) -> List[int]:
+        """
+        描画可能（3点以上）な形状のインデックスを返す。
         
-        # スケールバー描画（actual_scaleを渡す）
-        self._add_scale_bar_with_scale(dwg, svg_width, svg_height, actual_scale)
+        Args:
+            shapes: (N, 2)の座標配列のリスト
         
-        # 注記追加
-        self._add_technical_notes(dwg, svg_width, svg_height)
+        Returns:
+            List[int]: 有効な形状のインデックス
+        """
+        lengths = np.fromiter(map(len, shapes), dtype=np.intp, count=len(shapes))
+        return np.flatnonzero(lengths >= 3).tolist()
+    
+    def _write_path_element(self, f, shapes: List[np.ndarray], prefix: bytes):
+        """
+        同じクラスの閉じた形状をまとめて1つの<path>要素としてファイルに書き出す。
         
-        # SVG保存
-        dwg.save()
-        return output_path
+        Args:
+            f: バイナリモードで開いた出力ファイル
+            shapes: SVG座標系の頂点配列のリスト
+            prefix: クラス名とd属性の開始までを含む要素の先頭部分
+        """
+        if not shapes:
+            return
+        f.writelines((prefix, format_path_data(shapes), b'" />'))
     
-    def _add_scale_bar_with_scale(self, dwg, svg_width: float, svg_height: float, actual_scale: float):
-        """動的サイズ用スケールバー追加"""
-        # スケールバー仕様
-        bar_length_mm = 50.0  # 50mm (5cm)
-        bar_length_px = bar_length_mm * actual_scale / 10  # スケールに合わせて調整
+    def _scale_bar_markup(self, canvas: Dict) -> str:
+        """動的サイズ用スケールバーのSVG要素"""
+        bar_length_mm = canvas["bar_length_mm"]
+        bar_length_px = canvas["bar_length_px"]
         
         # 配置位置 (左下)
         bar_x = 50
-        bar_y = svg_height - 50
-        
-        # スケールバー本体
-        dwg.add(dwg.line(start=(bar_x, bar_y), end=(bar_x + bar_length_px, bar_y),
-                        stroke='black', stroke_width=2))
-        
-        # 目盛り
-        dwg.add(dwg.line(start=(bar_x, bar_y - 6), end=(bar_x, bar_y + 6),
-                        stroke='black', stroke_width=1.5))
-        dwg.add(dwg.line(start=(bar_x + bar_length_px, bar_y - 6), 
-                        end=(bar_x + bar_length_px, bar_y + 6),
-                        stroke='black', stroke_width=1.5))
-        
-        # ラベル
-        scale_text = f"{bar_length_mm:.0f} mm"
-        dwg.add(dwg.text(scale_text, insert=(bar_x + bar_length_px/2, bar_y - 12),
-                        text_anchor="middle", class_="scale-text"))
+        bar_y = canvas["svg_height"] - 50
+        
+        return _SCALE_BAR_TEMPLATE.format(
+            x0=bar_x, x1=bar_x + bar_length_px, y=bar_y,
+            tick_top=bar_y - 6, tick_bottom=bar_y + 6,
+            label_x=bar_x + bar_length_px / 2, label_y=bar_y - 12,
+            label=f"{bar_length_mm:.0f} mm"
+        )
 
     def _calculate_polygon_area(self, points):
         """
@@ -254,11 +404,8 @@ class SVGExporter:
             return 12  # デフォルトサイズを小さく
         
         # 境界ボックスを計算
-        xs = [p[0] for p in polygon_points]
-        ys = [p[1] for p in polygon_points]
-        
-        bbox_width = max(xs) - min(xs)
-        bbox_height = max(ys) - min(ys)
+        extent = np.ptp(np.asarray(polygon_points, dtype=np.float64).reshape(-1, 2), axis=0)
+        bbox_width, bbox_height = extent.tolist()
         
         # 最小辺長を取得
         min_dimension = min(bbox_width, bbox_height)
@@ -271,20 +418,49 @@ class SVGExporter:
         # 最大: 48px（印刷向け上限）
         font_size = max(10, min(48, font_size))
         
-        return font_size
+        # 座標と同じく小数点以下3桁に丸め、float32座標由来の端数を出力に含めない
+        return round(font_size, 3)
     
-    def _add_technical_notes(self, dwg, svg_width: float, svg_height: float):
-        """動的サイズ用技術注記・凡例追加"""
-        notes_x = svg_width - 250
-        notes_y = svg_height - 80
-        
-        notes = [
-            "切り取り線 (Cut Lines)",
-            "━━━ 実線で切断",
-        ]
+    def _technical_notes_markup(self, canvas: Dict) -> str:
+        """動的サイズ用技術注記・凡例のSVG要素"""
+        notes_x = canvas["svg_width"] - 250
+        notes_y = canvas["svg_height"] - 80
+        
+        return "".join(
+            f'<text class="note-text" x="{notes_x}" y="{notes_y + i * 18}">{escape(note)}</text>'
+            for i, note in enumerate(_TECHNICAL_NOTES)
+        )
+    
+    def _transform_group_shapes(self, group: Dict, scale: float, offset_x: float,
+                                offset_y: float) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        グループの全ポリゴン・タブの頂点を1つの配列に連結し、スケールとオフセットを
+        一度のアフィン変換で適用してから元の単位に分割する。
+        
+        Args:
+            group: 配置済みグループ
+            scale: 倍率
+            offset_x: X方向オフセット
+            offset_y: Y方向オフセット
         
-        for i, note in enumerate(notes):
-            dwg.add(dwg.text(note, insert=(notes_x, notes_y + i * 18), class_="note-text"))
+        Returns:
+            Tuple[List[np.ndarray], List[np.ndarray]]: 変換後の(ポリゴン, タブ)の(N, 2)配列。
+                展開エンジン由来のfloat32座標はfloat32のまま扱う（出力は小数点以下3桁のため精度は十分）
+        """
+        polygons = list(group.get("polygons", []))
+        tabs = list(group.get("tabs", []))
+        point_arrays = [np.asarray(shape).reshape(-1, 2) for shape in polygons + tabs]
+        if not point_arrays:
+            return [], []
+        
+        stacked = np.concatenate(point_arrays)
+        if not np.issubdtype(stacked.dtype, np.floating):
+            stacked = stacked.astype(np.float64)
+        stacked *= stacked.dtype.type(scale)
+        stacked += np.array((offset_x, offset_y), dtype=stacked.dtype)
+        
+        shapes_px = np.split(stacked, np.cumsum([len(points) for points in point_arrays[:-1]], dtype=np.intp))
+        return shapes_px[:len(polygons)], shapes_px[len(polygons):]
     
     def _calculate_overall_bbox(self, placed_groups: List[Dict]) -> Dict:
         """
@@ -293,25 +469,20 @@ class SVGExporter:
         if not placed_groups:
             return {"min_x": 0, "min_y": 0, "max_x": 0, "max_y": 0, "width": 0, "height": 0}
         
-        min_x = float('inf')
-        min_y = float('inf')
-        max_x = float('-inf')
-        max_y = float('-inf')
+        # 全ポリゴン・タブの頂点を連結して一括で最小・最大を求める
+        point_arrays = [
+            np.asarray(shape).reshape(-1, 2)
+            for group in placed_groups
+            for shape in list(group.get("polygons", [])) + list(group.get("tabs", []))
+        ]
+        all_points = np.concatenate(point_arrays) if point_arrays else np.empty((0, 2))
         
-        for group in placed_groups:
-            for polygon in group.get("polygons", []):
-                for x, y in polygon:
-                    min_x = min(min_x, x)
-                    min_y = min(min_y, y)
-                    max_x = max(max_x, x)
-                    max_y = max(max_y, y)
-            
-            for tab in group.get("tabs", []):
-                for x, y in tab:
-                    min_x = min(min_x, x)
-                    min_y = min(min_y, y)
-                    max_x = max(max_x, x)
-                    max_y = max(max_y, y)
+        if len(all_points) == 0:
+            min_x = min_y = float('inf')
+            max_x = max_y = float('-inf')
+        else:
+            min_x, min_y = all_points.min(axis=0).tolist()
+            max_x, max_y = all_points.max(axis=0).tolist()
         
         return {
             "min_x": min_x,
@@ -387,6 +558,7 @@ class SVGExporter:
         """))
         
         margin_px = self.print_margin_mm * self.mm_to_px
+        group_batches = []
         
         # 各ページを描画
         for page_num, page_groups in enumerate(paged_groups, 1):
@@ -430,42 +602,9 @@ class SVGExporter:
                     class_="cut-mark"
                 ))
             
-            # グループを描画（mm単位の座標をpxに変換）
-            for group in page_groups:
-                # 面ポリゴン描画
-                for poly_idx, polygon in enumerate(group.get("polygons", [])):
-                    if len(polygon) >= 3:
-                        # mm単位の座標をピクセルに変換（scale_factorは使わず、mm_to_pxで変換）
-                        points = [
-                            (x * self.mm_to_px + margin_px, 
-                             y * self.mm_to_px + margin_px + page_y_offset) 
-                            for x, y in polygon
-                        ]
-                        dwg.add(dwg.polygon(points=points, class_="face-polygon"))
-                        
-                        # 面番号を描画
-                        if "face_numbers" in group and poly_idx < len(group["face_numbers"]):
-                            center_x = sum(p[0] for p in points) / len(points)
-                            center_y = sum(p[1] for p in points) / len(points)
-                            font_size = self._calculate_face_number_size(points)
-                            face_number = group["face_numbers"][poly_idx]
-                            
-                            dwg.add(dwg.text(
-                                str(face_number),
-                                insert=(center_x, center_y),
-                                style=f"font-family: Arial, sans-serif; font-size: {font_size}px; font-weight: bold; fill: #ff0000; text-anchor: middle;",
-                                dominant_baseline="middle"
-                            ))
-                
-                # タブ描画
-                for tab in group.get("tabs", []):
-                    if len(tab) >= 3:
-                        points = [
-                            (x * self.mm_to_px + margin_px, 
-                             y * self.mm_to_px + margin_px + page_y_offset) 
-                            for x, y in tab
-                        ]
-                        dwg.add(dwg.polygon(points=points, class_="tab-polygon"))
+            # グループの描画位置（mm単位の座標をpxに変換して保存時に書き出す）
+            dwg.add(dwg.g(class_=GROUP_CONTENT_CLASS))
+            group_batches.append((page_groups, self.mm_to_px, margin_px, margin_px + page_y_offset))
             
             # ページ番号とフォーマット情報
             dwg.add(dwg.text(
@@ -493,7 +632,7 @@ class SVGExporter:
                 ))
         
         # SVG保存
-        dwg.save()
+        self._save_with_group_elements(dwg.tostring(), output_path, group_batches)
         print(f"単一SVGファイルに{len(paged_groups)}ページを出力: {output_path}")
         return output_path
 
@@ -570,42 +709,8 @@ class SVGExporter:
                     class_="cut-mark"
                 ))
             
-            # グループを描画
-            for group in page_groups:
-                # 面ポリゴン描画
-                for poly_idx, polygon in enumerate(group.get("polygons", [])):
-                    if len(polygon) >= 3:
-                        # ページマージンを考慮した配置
-                        points = [
-                            (x * actual_scale + margin_px, 
-                             y * actual_scale + margin_px) 
-                            for x, y in polygon
-                        ]
-                        dwg.add(dwg.polygon(points=points, class_="face-polygon"))
-                        
-                        # 面番号を描画
-                        if "face_numbers" in group and poly_idx < len(group["face_numbers"]):
-                            center_x = sum(p[0] for p in points) / len(points)
-                            center_y = sum(p[1] for p in points) / len(points)
-                            font_size = self._calculate_face_number_size(points)
-                            face_number = group["face_numbers"][poly_idx]
-                            
-                            dwg.add(dwg.text(
-                                str(face_number),
-                                insert=(center_x, center_y),
-                                style=f"font-family: Arial, sans-serif; font-size: {font_size}px; font-weight: bold; fill: #ff0000; text-anchor: middle;",
-                                dominant_baseline="middle"
-                            ))
-                
-                # タブ描画
-                for tab in group.get("tabs", []):
-                    if len(tab) >= 3:
-                        points = [
-                            (x * actual_scale + margin_px, 
-                             y * actual_scale + margin_px) 
-                            for x, y in tab
-                        ]
-                        dwg.add(dwg.polygon(points=points, class_="tab-polygon"))
+            # グループの描画位置（保存時に書き出す）
+            dwg.add(dwg.g(class_=GROUP_CONTENT_CLASS))
             
             # ページ番号を追加
             dwg.add(dwg.text(
@@ -624,7 +729,9 @@ class SVGExporter:
             ))
             
             # SVG保存
-            dwg.save()
+            self._save_with_group_elements(
+                dwg.tostring(), output_path, [(page_groups, actual_scale, margin_px, margin_px)]
+            )
             svg_paths.append(output_path)
             
             print(f"ページ {page_num} を出力: {output_path}")
@@ -657,9 +764,13 @@ class SVGExporter:
             self.show_cut_lines = show_cut_lines
         if layout_mode is not None:
             self.layout_mode = layout_mode
-        if page_format is not None:
+        # ページ寸法は値が変わった場合のみ再計算する（同一設定の再送は素通り）
+        page_changed = False
+        if page_format is not None and page_format != self.page_format:
             self.page_format = page_format
-            self._calculate_page_dimensions()
-        if page_orientation is not None:
+            page_changed = True
+        if page_orientation is not None and page_orientation != self.page_orientation:
             self.page_orientation = page_orientation
+            page_changed = True
+        if page_changed:
             self._calculate_page_dimensions()
\ No newline at end of file
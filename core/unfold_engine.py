@@ -1,13 +1,26 @@
+import logging
 import math
+import multiprocessing
 import numpy as np
-from typing import List, Dict, Optional, Tuple
-from scipy.spatial import ConvexHull
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple, Union
 
-from config import OCCT_AVAILABLE
+from config import UNFOLD_MAX_WORKERS, UNFOLD_PARALLEL_MIN_GROUPS
+from core.geometry_analyzer import SURFACE_TYPE_CODES
+from core.unfold_kernels import (
+    as_points_array, apply_affine_2d, plane_basis, unroll_cylinder, unroll_cone, convex_hull_2d
+)
 
-if OCCT_AVAILABLE:
-    from OCC.Core.BRepAdaptor import BRepAdaptor_Surface
-    from OCC.Core.GeomAbs import GeomAbs_Plane, GeomAbs_Cylinder, GeomAbs_Cone
+# 面・境界線単位の詳細ログ（既定では出力しない）
+logger = logging.getLogger(__name__)
+
+
+# 展開処理に対応している面タイプ
+UNFOLDABLE_SURFACE_TYPES = ("plane", "cylinder", "cone")
+UNFOLDABLE_TYPE_CODES = np.array([SURFACE_TYPE_CODES[t] for t in UNFOLDABLE_SURFACE_TYPES], dtype=np.int8)
+
+# 境界線展開メモの上限エントリ数（超えたら全消去）
+BOUNDARY_CACHE_MAX_ENTRIES = 4096
 
 
 class UnfoldEngine:
@@ -29,20 +42,77 @@ class UnfoldEngine:
         # 展開対象データへの参照
         self.faces_data = None
         self.edges_data = None
+        self.face_arrays: Optional[Dict[str, np.ndarray]] = None
+        self.edge_arrays: Optional[Dict[str, np.ndarray]] = None
         
         # 展開グループ
         self.unfold_groups: List[List[int]] = []
+        
+        # 境界線展開結果のメモ（同一形状の面の繰り返しを再計算しない）
+        self._boundary_unfold_cache: Dict[Tuple, List[Tuple[float, float]]] = {}
+        
+        # 面ごとの展開パラメータ（配列化・正規化済み）のキャッシュ
+        self._face_param_cache: Dict[int, Dict] = {}
+        
+        # 面タイプ別の展開処理（タイプ名 -> (展開メソッド, 表示名)）
+        self._group_unfolders = {
+            "plane": (self._unfold_planar_group, "平面"),
+            "cylinder": (self._unfold_cylindrical_group, "円筒"),
+            "cone": (self._unfold_conical_group, "円錐"),
+        }
+        
+        # グループ展開の並列ワーカー数（1以下で逐次処理）
+        self.max_workers = UNFOLD_MAX_WORKERS
+        self.parallel_min_groups = UNFOLD_PARALLEL_MIN_GROUPS
+        # リクエスト単位で並列展開を無効にする場合はFalse
+        self.parallel_enabled = True
     
-    def set_geometry_data(self, faces_data: List[Dict], edges_data: List[Dict]):
+    def set_geometry_data(self, faces_data: List[Dict], edges_data: List[Dict],
+                          face_arrays: Optional[Dict[str, np.ndarray]] = None,
+                          edge_arrays: Optional[Dict[str, np.ndarray]] = None):
         """
         幾何学データを設定
         
         Args:
             faces_data: 面データのリスト
             edges_data: エッジデータのリスト
+            face_arrays: 面属性の配列表現（GeometryAnalyzer.face_arrays）
+            edge_arrays: エッジ隣接面の配列表現（GeometryAnalyzer.edge_arrays）
         """
         self.faces_data = faces_data
         self.edges_data = edges_data
+        self.face_arrays = face_arrays
+        self.edge_arrays = edge_arrays
+        self._face_param_cache = {}
+    
+    def classify_fold_edges(self, min_fold_angle_deg: float = 1.0) -> np.ndarray:
+        """
+        各エッジが折り線（2つの平面が角度をなして接する共有エッジ）かどうかを一括判定。
+        法線は面の向き（TopAbs_REVERSED）で反転して外向きに揃えてから比較する。
+        曲面を含むエッジは法線が一定でないため判定対象外とし、境界エッジ・同一平面上の継ぎ目と同じくFalseを返す。
+        
+        Args:
+            min_fold_angle_deg: 折り線とみなす最小の面間角度（度）
+        
+        Returns:
+            np.ndarray: edges_dataと同じ順序のboolマスク（Trueが折り線）
+        """
+        if self.edge_arrays is None or self.face_arrays is None:
+            return np.zeros(len(self.edges_data or []), dtype=bool)
+        
+        face_a = self.edge_arrays["face_a"]
+        face_b = self.edge_arrays["face_b"]
+        is_planar = self.face_arrays["surface_type"] == SURFACE_TYPE_CODES["plane"]
+        shared = (face_a >= 0) & (face_b >= 0)
+        # 両側が平面の共有エッジのみ判定（-1の添字は後段でsharedにより除外される）
+        target = shared & is_planar[face_a] & is_planar[face_b]
+        
+        outward = self.face_arrays["normals"] * np.where(self.face_arrays["reversed"], -1.0, 1.0)[:, None]
+        cos_theta = np.einsum("ij,ij->i", outward[face_a[target]], outward[face_b[target]])
+        
+        is_fold = np.zeros(len(face_a), dtype=bool)
+        is_fold[target] = cos_theta < math.cos(math.radians(min_fold_angle_deg))
+        return is_fold
     
     def group_faces_for_unfolding(self, max_faces: int = 20) -> List[List[int]]:
         """
@@ -58,7 +128,15 @@ class UnfoldEngine:
         if self.faces_data is None:
             raise ValueError("faces_dataが設定されていません")
         
-        unfoldable_faces = [i for i, face in enumerate(self.faces_data) if face["unfoldable"]]
+        # 展開アルゴリズムのある面タイプ（平面・円筒・円錐）のみを候補とする
+        if self.face_arrays is not None and len(self.face_arrays["surface_type"]) == len(self.faces_data):
+            mask = self.face_arrays["unfoldable"] & np.isin(self.face_arrays["surface_type"], UNFOLDABLE_TYPE_CODES)
+            unfoldable_faces = np.flatnonzero(mask).tolist()
+        else:
+            unfoldable_faces = [
+                i for i, face in enumerate(self.faces_data)
+                if face["unfoldable"] and face["surface_type"] in UNFOLDABLE_SURFACE_TYPES
+            ]
         
         if not unfoldable_faces:
             print("展開可能な面がありません")
@@ -89,41 +167,133 @@ class UnfoldEngine:
         if self.faces_data is None:
             raise ValueError("faces_dataが設定されていません")
         
-        unfolded_groups = []
-        
         print(f"=== 面グループ展開開始 ===")
         print(f"グループ数: {len(self.unfold_groups)}")
         
-        for group_idx, face_indices in enumerate(self.unfold_groups):
-            print(f"\n--- グループ {group_idx} ---")
-            print(f"面数: {len(face_indices)}")
-            print(f"面インデックス: {face_indices}")
-            
-            # 各面の詳細情報を表示
-            for i, face_idx in enumerate(face_indices):
-                if face_idx < len(self.faces_data):
-                    face_data = self.faces_data[face_idx]
-                    print(f"  面{i}(idx={face_idx}): {face_data['surface_type']}, 面積={face_data.get('area', 'N/A')}")
-                else:
-                    print(f"  面{i}(idx={face_idx}): インデックスが範囲外")
-            
+        # 各グループは独立に展開できるため、グループ数が多い場合はプロセスを分けて処理
+        if (self.parallel_enabled and self.max_workers > 1
+                and len(self.unfold_groups) >= self.parallel_min_groups):
             try:
-                group_result = self._unfold_single_group(group_idx, face_indices)
-                if group_result:
-                    print(f"  → 展開成功: {len(group_result.get('polygons', []))}個のポリゴン")
-                    unfolded_groups.append(group_result)
-                else:
-                    print(f"  → 展開失敗: 結果がNone")
+                results = self._unfold_groups_parallel()
             except Exception as e:
-                print(f"  → グループ{group_idx}の展開でエラー: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
+                print(f"並列展開に失敗したため逐次処理に切り替えます: {e}")
+                results = [self._unfold_group_safe(idx, face_indices)
+                           for idx, face_indices in enumerate(self.unfold_groups)]
+        else:
+            results = [self._unfold_group_safe(idx, face_indices)
+                       for idx, face_indices in enumerate(self.unfold_groups)]
+        
+        unfolded_groups = [result for result in results if result]
         
         print(f"\n=== 展開完了 ===")
         print(f"成功したグループ数: {len(unfolded_groups)}")
         return unfolded_groups
     
+    def _unfold_groups_parallel(self) -> List[Optional[Dict]]:
+        """
+        プロセスプールで各グループを並列展開。面データは各ワーカーに一度だけ渡す。
+        
+        Returns:
+            List[Optional[Dict]]: グループ順の展開結果（失敗したグループはNone）
+        """
+        workers = min(self.max_workers, len(self.unfold_groups))
+        print(f"並列展開: {workers}プロセス")
+        chunksize = max(1, len(self.unfold_groups) // (workers * 4))
+        
+        # API処理はスレッドプール上で動くため、fork時のロック状態を引き継がないspawnで起動する
+        # グループ展開はエッジデータを使わないため、ワーカーには面データのみ渡す
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_unfold_worker,
+            initargs=(self._worker_faces_data(), [], self.scale_factor, self.tab_width)
+        ) as executor:
+            results = list(executor.map(
+                _unfold_group_worker, enumerate(self.unfold_groups), chunksize=chunksize
+            ))
+        
+        # pickle経由で受け取ったビューは個別の配列に戻っているため、グループごとに連続領域へまとめ直す
+        return [self._to_float32_buffers(result) if result else None for result in results]
+    
+    def _worker_faces_data(self) -> List[Dict]:
+        """
+        ワーカープロセスへ渡す面データを作成。
+        配列形式の境界線（boundary_curves_np）がある面では、同内容のタプルのリストを除いて
+        pickleするデータ量を抑える。
+        
+        Returns:
+            List[Dict]: ワーカー用の面データ
+        """
+        return [
+            {key: value for key, value in face_data.items() if key != "boundary_curves"}
+            if "boundary_curves_np" in face_data else face_data
+            for face_data in self.faces_data
+        ]
+    
+    def _unfold_group_safe(self, group_idx: int, face_indices: List[int]) -> Optional[Dict]:
+        """
+        単一グループを展開し、例外はログ出力してNoneを返す。
+        
+        Args:
+            group_idx: グループインデックス
+            face_indices: 面インデックスのリスト
+        
+        Returns:
+            Optional[Dict]: float32座標に変換済みの展開結果
+        """
+        print(f"\n--- グループ {group_idx} ---")
+        print(f"面数: {len(face_indices)}")
+        
+        # 各面の詳細情報はデバッグログが有効な場合のみ組み立てる
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("面インデックス: %s", face_indices)
+            for i, face_idx in enumerate(face_indices):
+                if face_idx < len(self.faces_data):
+                    face_data = self.faces_data[face_idx]
+                    logger.debug("  面%d(idx=%d): %s, 面積=%s", i, face_idx,
+                                 face_data["surface_type"], face_data.get("area", "N/A"))
+                else:
+                    logger.debug("  面%d(idx=%d): インデックスが範囲外", i, face_idx)
+        
+        try:
+            group_result = self._unfold_single_group(group_idx, face_indices)
+            if group_result:
+                print(f"  → 展開成功: {len(group_result.get('polygons', []))}個のポリゴン")
+                return self._to_float32_buffers(group_result)
+            print(f"  → 展開失敗: 結果がNone")
+        except Exception as e:
+            print(f"  → グループ{group_idx}の展開でエラー: {e}")
+            import traceback
+            traceback.print_exc()
+        return None
+    
+    def _to_float32_buffers(self, group_result: Dict) -> Dict:
+        """
+        展開結果のポリゴン・タブ座標を1つの連続した(N, 2)のfloat32配列にまとめ、
+        各ポリゴン・タブをその部分ビューとして持たせる。
+        展開後の座標はレイアウトとSVG出力（小数点以下数桁）にしか使わないため精度は十分。
+        
+        Args:
+            group_result: 展開結果
+        
+        Returns:
+            Dict: 座標をfloat32配列のビューに置き換えた展開結果
+        """
+        polygons = [np.asarray(polygon).reshape(-1, 2) for polygon in group_result.get("polygons", [])]
+        tabs = [np.asarray(tab).reshape(-1, 2) for tab in group_result.get("tabs", [])]
+        shapes = polygons + tabs
+        if not shapes:
+            group_result["polygons"], group_result["tabs"] = [], []
+            return group_result
+        
+        # グループ内の全頂点を1回の確保で格納し、形状ごとの小さな配列を作らない
+        buffer = np.concatenate(shapes, dtype=np.float32)
+        ring_offsets = np.cumsum([len(shape) for shape in shapes[:-1]], dtype=np.intp)
+        views = np.split(buffer, ring_offsets)
+        group_result["polygons"] = views[:len(polygons)]
+        group_result["tabs"] = views[len(polygons):]
+        return group_result
+    
     def _unfold_single_group(self, group_idx: int, face_indices: List[int]) -> Optional[Dict]:
         """
         単一面グループの展開処理。
@@ -144,19 +314,15 @@ class UnfoldEngine:
         
         print(f"    グループ{group_idx}: 主面タイプ={surface_type}")
         
+        unfolder = self._group_unfolders.get(surface_type)
+        if unfolder is None:
+            print(f"    → 未対応の曲面タイプ: {surface_type}")
+            return None
+        
         try:
-            if surface_type == "plane":
-                print(f"    → 平面グループとして展開")
-                return self._unfold_planar_group(group_idx, face_indices)
-            elif surface_type == "cylinder":
-                print(f"    → 円筒グループとして展開")
-                return self._unfold_cylindrical_group(group_idx, face_indices)
-            elif surface_type == "cone":
-                print(f"    → 円錐グループとして展開")
-                return self._unfold_conical_group(group_idx, face_indices)
-            else:
-                print(f"    → 未対応の曲面タイプ: {surface_type}")
-                return None
+            unfold_func, type_label = unfolder
+            print(f"    → {type_label}グループとして展開")
+            return unfold_func(group_idx, face_indices)
                 
         except Exception as e:
             print(f"    → グループ{group_idx}展開エラー: {e}")
@@ -177,25 +343,24 @@ class UnfoldEngine:
         """
         polygons = []
         
-        print(f"      平面グループ{group_idx}を展開中...")
+        logger.debug("平面グループ%dを展開中...", group_idx)
         
         for face_idx in face_indices:
-            face_data = self.faces_data[face_idx]
-            
             # 平面情報を取得
-            normal = np.array(face_data["plane_normal"])
-            origin = np.array(face_data["plane_origin"])
+            params = self._face_unfold_params(face_idx)
+            normal = params["normal"]
+            origin = params["origin"]
             
-            print(f"        面{face_idx}: 法線={normal}, 原点={origin}")
+            logger.debug("面%d: 法線=%s, 原点=%s", face_idx, normal, origin)
             
             # 面の正確な境界形状を取得
-            face_polygons = self._extract_face_2d_shape(face_idx, normal, origin)
-            print(f"        面{face_idx}: {len(face_polygons) if face_polygons else 0}個の2D形状を抽出")
+            face_polygons = self._extract_face_2d_shape(face_idx, normal, origin, params["basis"])
+            logger.debug("面%d: %d個の2D形状を抽出", face_idx, len(face_polygons) if face_polygons else 0)
             
             if face_polygons:
                 polygons.extend(face_polygons)
         
-        print(f"      平面グループ{group_idx}: 合計{len(polygons)}個のポリゴン")
+        logger.debug("平面グループ%d: 合計%d個のポリゴン", group_idx, len(polygons))
         
         # 面番号のマッピングを追加
         face_numbers = []
@@ -241,15 +406,13 @@ class UnfoldEngine:
         
         # 円筒面の展開
         for face_idx in cylindrical_faces:
-            face_data = self.faces_data[face_idx]
-            
             # 円筒パラメータ
-            axis = np.array(face_data["cylinder_axis"])
-            center = np.array(face_data["cylinder_center"])
-            radius = face_data["cylinder_radius"]
+            params = self._face_unfold_params(face_idx)
             
             # 円筒面の正確な2D形状を取得
-            cylinder_polygons = self._extract_cylindrical_face_2d(face_idx, axis, center, radius)
+            cylinder_polygons = self._extract_cylindrical_face_2d(
+                face_idx, params["axis"], params["center"], params["radius"], params["ref_dir"]
+            )
             if cylinder_polygons:
                 polygons.extend(cylinder_polygons)
         
@@ -294,16 +457,14 @@ class UnfoldEngine:
         polygons = []
         
         for face_idx in face_indices:
-            face_data = self.faces_data[face_idx]
-            
             # 円錐パラメータ
-            apex = np.array(face_data["cone_apex"])
-            axis = np.array(face_data["cone_axis"])
-            radius = face_data["cone_radius"]
-            semi_angle = face_data["cone_semi_angle"]
+            params = self._face_unfold_params(face_idx)
             
             # 円錐面の正確な2D形状を取得
-            cone_polygons = self._extract_conical_face_2d(face_idx, apex, axis, radius, semi_angle)
+            cone_polygons = self._extract_conical_face_2d(
+                face_idx, params["apex"], params["axis"], params["radius"],
+                params["semi_angle"], params["ref_dir"]
+            )
             if cone_polygons:
                 polygons.extend(cone_polygons)
         
@@ -323,7 +484,71 @@ class UnfoldEngine:
             "unfold_method": "conical_unwrap"
         }
     
-    def _extract_face_2d_shape(self, face_idx: int, normal: np.ndarray, origin: np.ndarray) -> List[List[Tuple[float, float]]]:
+    def _face_unfold_params(self, face_idx: int) -> Dict:
+        """
+        面の展開パラメータを配列化して取得（初回のみ構築し、以降はキャッシュを返す）。
+        曲面の軸は単位ベクトル化し、展開の基準方向も合わせて保持する。
+        
+        Args:
+            face_idx: 面インデックス
+        
+        Returns:
+            Dict: 曲面タイプに応じた展開パラメータ
+        """
+        params = self._face_param_cache.get(face_idx)
+        if params is not None:
+            return params
+        
+        face_data = self.faces_data[face_idx]
+        surface_type = face_data["surface_type"]
+        
+        if surface_type == "cylinder":
+            axis, ref_dir = self._axis_reference_frame(face_data["cylinder_axis"])
+            params = {
+                "axis": axis,
+                "ref_dir": ref_dir,
+                "center": np.asarray(face_data["cylinder_center"], dtype=np.float64),
+                "radius": float(face_data["cylinder_radius"]),
+            }
+        elif surface_type == "cone":
+            axis, ref_dir = self._axis_reference_frame(face_data["cone_axis"])
+            params = {
+                "axis": axis,
+                "ref_dir": ref_dir,
+                "apex": np.asarray(face_data["cone_apex"], dtype=np.float64),
+                "radius": float(face_data["cone_radius"]),
+                "semi_angle": float(face_data["cone_semi_angle"]),
+            }
+        else:
+            normal = np.asarray(face_data["plane_normal"], dtype=np.float64)
+            params = {
+                "normal": normal,
+                "origin": np.asarray(face_data["plane_origin"], dtype=np.float64),
+                "basis": np.vstack(plane_basis(normal / np.linalg.norm(normal))),
+            }
+        
+        self._face_param_cache[face_idx] = params
+        return params
+    
+    def _axis_reference_frame(self, axis) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        曲面の軸を単位ベクトル化し、軸に直交する展開の基準方向を求める。
+        
+        Args:
+            axis: 軸ベクトル
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (単位軸ベクトル, 単位基準方向ベクトル)
+        """
+        axis = np.asarray(axis, dtype=np.float64)
+        axis = axis / np.linalg.norm(axis)
+        
+        # 基準方向ベクトル設定（軸に最も直交する座標軸から導出）
+        ref_dir, _ = plane_basis(axis)
+        return axis, ref_dir
+    
+    def _extract_face_2d_shape(self, face_idx: int, normal: np.ndarray, origin: np.ndarray,
+                               basis: Optional[np.ndarray] = None) -> List[List[Tuple[float, float]]]:
         """
         面の正確な2D形状を抽出（外形線・内形線を考慮）。
         
@@ -331,6 +556,7 @@ class UnfoldEngine:
             face_idx: 面インデックス
             normal: 法線ベクトル
             origin: 原点
+            basis: 計算済みの平面座標系（(2, 3)の行列）
         
         Returns:
             List[List[Tuple[float, float]]]: 2Dポリゴンのリスト
@@ -338,34 +564,90 @@ class UnfoldEngine:
         face_data = self.faces_data[face_idx]
         polygons_2d = []
         
-        print(f"面{face_idx}の2D形状を抽出中...")
-        print(f"  境界線数: {len(face_data['boundary_curves'])}")
+        logger.debug("面%dの2D形状を抽出中...", face_idx)
+        boundaries = self._boundary_arrays(face_data)
+        logger.debug("境界線数: %d", len(boundaries))
         
         # 各境界線を2Dに投影
-        for boundary_idx, boundary in enumerate(face_data["boundary_curves"]):
-            print(f"  境界線{boundary_idx}: {len(boundary)}点")
+        for boundary_idx, boundary in enumerate(boundaries):
+            logger.debug("境界線%d: %d点", boundary_idx, len(boundary))
             
             if len(boundary) >= 3:
-                # 3D境界点を2D平面に正確に投影
-                projected_boundary = self._project_points_to_plane_accurate(boundary, normal, origin)
+                def project_and_simplify():
+                    # 3D境界点を2D平面に正確に投影
+                    projected_boundary = self._project_points_to_plane_accurate(boundary, normal, origin, basis)
+                    
+                    # 境界線を単純化（正方形/長方形の場合は4点に削減）
+                    return self._simplify_boundary_polygon(projected_boundary)
                 
-                # 境界線を単純化（正方形/長方形の場合は4点に削減）
-                simplified_boundary = self._simplify_boundary_polygon(projected_boundary)
+                simplified_boundary = self._memoized_boundary_unfold(
+                    "plane", normal, boundary, origin, project_and_simplify
+                )
                 
                 # 有効な2D形状の場合のみ追加
                 if len(simplified_boundary) >= 3:
                     polygons_2d.append(simplified_boundary)
-                    print(f"  境界線{boundary_idx}を2D投影: {len(simplified_boundary)}点（簡略化済み）")
+                    logger.debug("境界線%dを2D投影: %d点（簡略化済み）", boundary_idx, len(simplified_boundary))
                 else:
-                    print(f"  境界線{boundary_idx}の投影に失敗")
+                    logger.debug("境界線%dの投影に失敗", boundary_idx)
             else:
-                print(f"  境界線{boundary_idx}の点数が不足: {len(boundary)}点")
+                logger.debug("境界線%dの点数が不足: %d点", boundary_idx, len(boundary))
         
-        print(f"面{face_idx}の2D形状: {len(polygons_2d)}個のポリゴン")
+        logger.debug("面%dの2D形状: %d個のポリゴン", face_idx, len(polygons_2d))
         return polygons_2d
     
+    def _boundary_arrays(self, face_data: Dict) -> List[np.ndarray]:
+        """
+        面の境界線を(N, 3)の連続配列のリストとして取得。
+        解析時に作成済みの"boundary_curves_np"があればそれを使い、
+        キャッシュ復元データ等でリスト形式しかない場合はここで変換する。
+        
+        Args:
+            face_data: 面データ
+        
+        Returns:
+            List[np.ndarray]: 境界線ごとの3D点配列
+        """
+        boundaries = face_data.get("boundary_curves_np")
+        if boundaries is None:
+            boundaries = [as_points_array(boundary) for boundary in face_data["boundary_curves"]]
+        return boundaries
+    
+    def _memoized_boundary_unfold(self, kind: str, surface_params: np.ndarray,
+                                  boundary: List[Tuple[float, float, float]], anchor: np.ndarray,
+                                  compute) -> Union[np.ndarray, List[Tuple[float, float]]]:
+        """
+        境界線の展開結果を幾何学的な指紋でメモ化。
+        展開結果は基準点（平面原点・円筒中心・円錐頂点）からの相対位置と
+        曲面パラメータだけで決まるため、平行移動した同一形状の面では結果を再利用できる。
+        
+        Args:
+            kind: 曲面タイプ
+            surface_params: 結果に影響する曲面パラメータ（法線・軸・半径等）
+            boundary: 3D境界点群
+            anchor: 基準点
+            compute: キャッシュミス時に展開結果を計算する関数
+        
+        Returns:
+            展開された2D点群（computeの戻り値と同じ型のコピー）
+        """
+        relative = as_points_array(boundary) - np.asarray(anchor, dtype=np.float64)
+        # 6桁に量子化（+0.0で-0.0を正規化）してキーとする
+        params_q = np.round(np.asarray(surface_params, dtype=np.float64), 6) + 0.0
+        relative_q = np.round(relative, 6) + 0.0
+        cache_key = (kind, params_q.tobytes(), relative_q.shape, relative_q.tobytes())
+        
+        cached = self._boundary_unfold_cache.get(cache_key)
+        if cached is None:
+            cached = compute()
+            if len(self._boundary_unfold_cache) >= BOUNDARY_CACHE_MAX_ENTRIES:
+                self._boundary_unfold_cache.clear()
+            self._boundary_unfold_cache[cache_key] = cached
+        return cached.copy() if isinstance(cached, np.ndarray) else list(cached)
+    
     def _project_points_to_plane_accurate(self, points_3d: List[Tuple[float, float, float]], 
-                                         normal: np.ndarray, origin: np.ndarray) -> List[Tuple[float, float]]:
+                                         normal: np.ndarray, origin: np.ndarray,
+                                         basis: Optional[np.ndarray] = None) -> np.ndarray:
         """
         3D点群を平面に正確に投影（直交座標系を構築）。
         
@@ -373,45 +655,21 @@ class UnfoldEngine:
             points_3d: 3D点群
             normal: 法線ベクトル
             origin: 原点
+            basis: 計算済みの平面座標系（(2, 3)の行列、省略時は法線から構築）
         
         Returns:
-            List[Tuple[float, float]]: 投影された2D点群
+            np.ndarray: 投影された2D点群 (N, 2)
         """
         if len(points_3d) < 3:
             return []
         
         # 平面の直交座標系を構築
-        normal = normal / np.linalg.norm(normal)
+        if basis is None:
+            normal = normal / np.linalg.norm(normal)
+            basis = np.vstack(plane_basis(normal))
         
-        # 第1軸：より安定した方向ベクトル選択
-        if abs(normal[0]) < 0.9:
-            u_axis = np.cross(normal, [1, 0, 0])
-        elif abs(normal[1]) < 0.9:
-            u_axis = np.cross(normal, [0, 1, 0])
-        else:
-            u_axis = np.cross(normal, [0, 0, 1])
-        
-        # ゼロベクトルチェック
-        if np.linalg.norm(u_axis) < 1e-8:
-            u_axis = np.array([1, 0, 0])
-        else:
-            u_axis = u_axis / np.linalg.norm(u_axis)
-        
-        # 第2軸：法線と第1軸の外積
-        v_axis = np.cross(normal, u_axis)
-        v_axis = v_axis / np.linalg.norm(v_axis)
-        
-        points_2d = []
-        
-        for point in points_3d:
-            # 原点からの相対位置
-            relative_pos = np.array(point) - origin
-            
-            # 平面座標系での座標計算
-            u = np.dot(relative_pos, u_axis)
-            v = np.dot(relative_pos, v_axis)
-            
-            points_2d.append((u, v))
+        # 全頂点を一括で平面座標系に変換
+        points_2d = apply_affine_2d(as_points_array(points_3d), basis, np.asarray(origin, dtype=np.float64))
         
         # 境界線の順序を確認・修正
         if len(points_2d) >= 3:
@@ -419,12 +677,12 @@ class UnfoldEngine:
         
         return points_2d
     
-    def _simplify_boundary_polygon(self, points_2d: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    def _simplify_boundary_polygon(self, points_2d) -> List[Tuple[float, float]]:
         """
         境界線ポリゴンを簡略化（形状に応じて適切な点数に削減）。
         
         Args:
-            points_2d: 2D点群
+            points_2d: 2D点群（タプルのリストまたは(N, 2)配列）
         
         Returns:
             List[Tuple[float, float]]: 簡略化された2D点群
@@ -438,206 +696,146 @@ class UnfoldEngine:
         if len(cleaned_points) < 3:
             return cleaned_points
         
-        print(f"        境界線簡略化: {len(points_2d)}点 → ", end="")
+        # 凸包は境界線ごとに一度だけ計算し、頂点数で形状を振り分ける
+        hull = self._boundary_hull(cleaned_points)
+        num_hull_vertices = len(hull) if hull is not None else 0
+        num_points = len(cleaned_points)
         
-        # 三角形の場合
-        if self._is_triangular_boundary(cleaned_points):
-            result = self._extract_triangle_corners(cleaned_points)
-            print(f"{len(result)}点（三角形）")
+        # 三角形の場合（最低でも6点は必要）
+        if num_hull_vertices == 3 and num_points >= 6:
+            result = self._extract_triangle_corners(cleaned_points, hull)
+            logger.debug("境界線簡略化: %d点 → %d点（三角形）", len(points_2d), len(result))
             return result
             
-        # 四角形の場合
-        if self._is_rectangular_boundary(cleaned_points):
-            result = self._extract_rectangle_corners(cleaned_points)
-            print(f"{len(result)}点（四角形）")
+        # 四角形の場合（最低でも8点は必要）
+        if num_hull_vertices == 4 and num_points >= 8:
+            result = self._extract_rectangle_corners(cleaned_points, hull)
+            logger.debug("境界線簡略化: %d点 → %d点（四角形）", len(points_2d), len(result))
             return result
         
-        # 五角形の場合（家の形状）
-        if self._is_pentagonal_boundary(cleaned_points):
-            result = self._extract_pentagon_corners(cleaned_points)
-            print(f"{len(result)}点（五角形）")
+        # 五角形の場合（家の形状、最低でも10点は必要）
+        if num_hull_vertices == 5 and num_points >= 10:
+            result = self._extract_pentagon_corners(cleaned_points, hull)
+            logger.debug("境界線簡略化: %d点 → %d点（五角形）", len(points_2d), len(result))
             return result
         
         # 六角形以上の多角形を検出
-        detected_corners = self._detect_polygon_corners(cleaned_points)
+        detected_corners = self._detect_polygon_corners(cleaned_points, hull)
         if detected_corners > 5:
             result = self._extract_corners_by_angle(cleaned_points, detected_corners)
-            print(f"{len(result)}点（{detected_corners}角形）")
+            logger.debug("境界線簡略化: %d点 → %d点（%d角形）", len(points_2d), len(result), detected_corners)
             return result
         
         # その他の多角形は適度に間引く
         result = self._thin_out_points(cleaned_points, max_points=12)
-        print(f"{len(result)}点（一般多角形）")
+        logger.debug("境界線簡略化: %d点 → %d点（一般多角形）", len(points_2d), len(result))
         return result
     
-    def _remove_duplicate_points_2d(self, points_2d: List[Tuple[float, float]], tolerance: float = 1e-6) -> List[Tuple[float, float]]:
+    def _boundary_hull(self, points_2d: List[Tuple[float, float]]) -> Optional[np.ndarray]:
         """
-        重複点を除去（2D点用）。
+        境界線の凸包頂点インデックスを計算。
         
         Args:
             points_2d: 2D点群
+        
+        Returns:
+            Optional[np.ndarray]: 凸包頂点のインデックス。点群が退化している場合None
+        """
+        try:
+            return convex_hull_2d(np.asarray(points_2d, dtype=np.float64))
+        except ValueError:
+            return None
+    
+    def _remove_duplicate_points_2d(self, points_2d, tolerance: float = 1e-6) -> List[Tuple[float, float]]:
+        """
+        重複点を除去（2D点用）。
+        
+        Args:
+            points_2d: 2D点群（タプルのリストまたは(N, 2)配列）
             tolerance: 許容誤差
         
         Returns:
             List[Tuple[float, float]]: 重複除去後の2D点群
         """
         if len(points_2d) < 2:
-            return points_2d
+            return [tuple(p) for p in np.asarray(points_2d, dtype=np.float64).tolist()]
         
-        cleaned_points = [points_2d[0]]
+        arr = as_points_array(points_2d, dim=2)
+        tolerance_sq = tolerance * tolerance
         
-        for i in range(1, len(points_2d)):
-            current = points_2d[i]
-            last = cleaned_points[-1]
-            
-            # 距離チェック
-            distance = math.sqrt((current[0] - last[0])**2 + (current[1] - last[1])**2)
-            if distance > tolerance:
-                cleaned_points.append(current)
+        # 隣接点との距離の二乗で判定（平方根は不要）
+        steps = np.diff(arr, axis=0)
+        step_sq = np.einsum("ij,ij->i", steps, steps)
+        keep = np.concatenate(([True], step_sq > tolerance_sq))
+        cleaned = arr[keep]
         
         # 最初と最後の点が重複している場合は除去
-        if len(cleaned_points) > 2:
-            first = cleaned_points[0]
-            last = cleaned_points[-1]
-            distance = math.sqrt((first[0] - last[0])**2 + (first[1] - last[1])**2)
-            if distance <= tolerance:
-                cleaned_points = cleaned_points[:-1]
-        
-        return cleaned_points
+        if len(cleaned) > 2:
+            closing = cleaned[0] - cleaned[-1]
+            if float(closing @ closing) <= tolerance_sq:
+                cleaned = cleaned[:-1]
+        
+        return [tuple(p) for p in cleaned.tolist()]
     
-    def _ensure_counterclockwise_order(self, points_2d: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    def _ensure_counterclockwise_order(self, points_2d):
         """
         境界線の点を反時計回りに並び替え（SVG描画に適した順序）。
         
         Args:
-            points_2d: 2D点群
+            points_2d: 2D点群（タプルのリストまたは(N, 2)配列）
         
         Returns:
-            List[Tuple[float, float]]: 反時計回りの2D点群
+            反時計回りの2D点群（入力と同じ型）
         """
         if len(points_2d) < 3:
             return points_2d
         
-        # 符号付き面積を計算（反時計回りなら正）
-        signed_area = 0.0
-        n = len(points_2d)
-        
-        for i in range(n):
-            j = (i + 1) % n
-            signed_area += (points_2d[j][0] - points_2d[i][0]) * (points_2d[j][1] + points_2d[i][1])
+        # 符号付き面積を計算（シューレース公式を一括で評価）
+        arr = as_points_array(points_2d, dim=2)
+        x = arr[:, 0]
+        y = arr[:, 1]
+        signed_area = float(np.dot(np.roll(x, -1) - x, np.roll(y, -1) + y))
         
-        # 時計回りの場合は順序を反転
+        # 時計回りの場合は順序を反転（リスト・配列の両方に対応）
         if signed_area > 0:
-            return list(reversed(points_2d))
+            return points_2d[::-1]
         else:
             return points_2d
     
-    def _is_triangular_boundary(self, points_2d: List[Tuple[float, float]]) -> bool:
-        """
-        境界線が三角形かどうかを判定。
-        
-        Args:
-            points_2d: 2D点群
-        
-        Returns:
-            bool: 三角形の場合True
-        """
-        if len(points_2d) < 6:  # 最低でも6点は必要
-            return False
-        
-        # 凸包を計算して3点になるかチェック
-        try:
-            points_array = np.array(points_2d)
-            hull = ConvexHull(points_array)
-            
-            # 凸包の頂点が3個なら三角形
-            return len(hull.vertices) == 3
-        except:
-            return False
-    
-    def _extract_triangle_corners(self, points_2d: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    def _extract_triangle_corners(self, points_2d: List[Tuple[float, float]],
+                                  hull: Optional[np.ndarray] = None) -> List[Tuple[float, float]]:
         """
         点群から三角形の3つの角を抽出。
         
         Args:
             points_2d: 2D点群
+            hull: 計算済みの凸包頂点インデックス（省略時はここで計算）
         
         Returns:
             List[Tuple[float, float]]: 三角形の角
         """
         try:
             points_array = np.array(points_2d)
-            hull = ConvexHull(points_array)
-            
-            # 凸包の頂点を取得
-            triangle_corners = [tuple(points_array[i]) for i in hull.vertices]
+            hull_vertices = hull if hull is not None else convex_hull_2d(points_array)
             
             # 3点になるように調整
-            if len(triangle_corners) == 3:
-                # 時計回りに並び替え
-                triangle_corners = self._sort_points_clockwise(triangle_corners)
-                # 閉じた三角形にする
-                triangle_corners.append(triangle_corners[0])
-                return triangle_corners
+            if len(hull_vertices) == 3:
+                # 凸包の頂点を時計回りに並べ、閉じた三角形にする
+                return self._closed_sorted_corners(points_array[hull_vertices])
             else:
                 # フォールバック：最初の3点を使用
                 return points_2d[:4]  # 最初の3点+閉じる点
         except:
             return points_2d[:4]  # フォールバック
     
-    def _is_rectangular_boundary(self, points_2d: List[Tuple[float, float]]) -> bool:
-        """
-        境界線が四角形（正方形・長方形）かどうかを判定。
-        
-        Args:
-            points_2d: 2D点群
-        
-        Returns:
-            bool: 四角形の場合True
-        """
-        if len(points_2d) < 8:  # 最低でも8点は必要
-            return False
-        
-        # 凸包を計算して4点になるかチェック
-        try:
-            points_array = np.array(points_2d)
-            hull = ConvexHull(points_array)
-            
-            # 凸包の頂点が4個なら四角形の可能性
-            if len(hull.vertices) == 4:
-                return True
-        except:
-            pass
-        
-        # フォールバック：境界ボックスベースの判定
-        xs = [p[0] for p in points_2d]
-        ys = [p[1] for p in points_2d]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-        
-        # 境界ボックスの角に近い点の数を確認
-        tolerance = 0.1
-        corner_count = 0
-        corners = [
-            (min_x, min_y), (max_x, min_y), 
-            (max_x, max_y), (min_x, max_y)
-        ]
-        
-        for corner in corners:
-            for point in points_2d:
-                distance = math.sqrt((point[0] - corner[0])**2 + (point[1] - corner[1])**2)
-                if distance < tolerance:
-                    corner_count += 1
-                    break
-        
-        return corner_count >= 4
-    
-    def _extract_rectangle_corners(self, points_2d: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    def _extract_rectangle_corners(self, points_2d: List[Tuple[float, float]],
+                                   hull: Optional[np.ndarray] = None) -> List[Tuple[float, float]]:
         """
         点群から四角形の4つの角を抽出。
         
         Args:
             points_2d: 2D点群
+            hull: 計算済みの凸包頂点インデックス（省略時はここで計算）
         
         Returns:
             List[Tuple[float, float]]: 四角形の角
@@ -645,23 +843,18 @@ class UnfoldEngine:
         try:
             # 凸包を使用して角を抽出
             points_array = np.array(points_2d)
-            hull = ConvexHull(points_array)
+            hull_vertices = hull if hull is not None else convex_hull_2d(points_array)
             
-            if len(hull.vertices) == 4:
-                # 凸包の頂点を時計回りに並び替え
-                rectangle_corners = [tuple(points_array[i]) for i in hull.vertices]
-                rectangle_corners = self._sort_points_clockwise(rectangle_corners)
-                # 閉じた四角形にする
-                rectangle_corners.append(rectangle_corners[0])
-                return rectangle_corners
+            if len(hull_vertices) == 4:
+                # 凸包の頂点を時計回りに並べ、閉じた四角形にする
+                return self._closed_sorted_corners(points_array[hull_vertices])
         except:
             pass
         
         # フォールバック：境界ボックスベースの抽出
-        xs = [p[0] for p in points_2d]
-        ys = [p[1] for p in points_2d]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
+        arr = as_points_array(points_2d, dim=2)
+        min_x, min_y = arr.min(axis=0).tolist()
+        max_x, max_y = arr.max(axis=0).tolist()
         
         # 4つの角を時計回りに並べる
         corners = [
@@ -674,26 +867,36 @@ class UnfoldEngine:
         
         return corners
     
-    def _sort_points_clockwise(self, points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    def _sort_points_clockwise(self, points) -> np.ndarray:
         """
         点を時計回りに並び替え。
         
         Args:
-            points: 2D点群
+            points: 2D点群（タプルのリストまたは(N, 2)配列）
         
         Returns:
-            List[Tuple[float, float]]: 時計回りの2D点群
+            np.ndarray: 時計回りの(N, 2)点配列
         """
-        # 重心を計算
-        center_x = sum(p[0] for p in points) / len(points)
-        center_y = sum(p[1] for p in points) / len(points)
+        arr = as_points_array(points, dim=2)
         
-        # 角度でソート
-        def angle_from_center(point):
-            return math.atan2(point[1] - center_y, point[0] - center_x)
+        # 重心からの角度でソート（同角度の点は元の順序を保つ）
+        center = arr.mean(axis=0)
+        angles = np.arctan2(arr[:, 1] - center[1], arr[:, 0] - center[0])
+        return arr[np.argsort(angles, kind="stable")]
+    
+    def _closed_sorted_corners(self, corners: np.ndarray) -> List[Tuple[float, float]]:
+        """
+        角の点を時計回りに並べ、始点を末尾に加えて閉じた多角形にする。
+        
+        Args:
+            corners: (N, 2)の角の点配列
         
-        sorted_points = sorted(points, key=angle_from_center)
-        return sorted_points
+        Returns:
+            List[Tuple[float, float]]: 閉じた多角形の頂点
+        """
+        sorted_corners = self._sort_points_clockwise(corners)
+        closed = np.vstack((sorted_corners, sorted_corners[:1]))
+        return [tuple(p) for p in closed.tolist()]
     
     def _extract_corners_by_angle(self, points_2d: List[Tuple[float, float]], num_corners: int) -> List[Tuple[float, float]]:
         """
@@ -709,28 +912,18 @@ class UnfoldEngine:
         if len(points_2d) < num_corners:
             return points_2d
         
-        # 重心を計算
-        center_x = sum(p[0] for p in points_2d) / len(points_2d)
-        center_y = sum(p[1] for p in points_2d) / len(points_2d)
-        
-        # 各点の角度を計算
-        angles_with_points = []
-        for point in points_2d:
-            angle = math.atan2(point[1] - center_y, point[0] - center_x)
-            # 角度を正の値に正規化
-            if angle < 0:
-                angle += 2 * math.pi
-            angles_with_points.append((angle, point))
-        
-        # 角度でソート
-        angles_with_points.sort(key=lambda x: x[0])
-        
-        # 等間隔で角を選択
-        corners = []
-        step = len(angles_with_points) // num_corners
-        for i in range(num_corners):
-            idx = (i * step) % len(angles_with_points)
-            corners.append(angles_with_points[idx][1])
+        arr = as_points_array(points_2d, dim=2)
+        
+        # 重心からの角度を計算し、正の値に正規化
+        center = arr.mean(axis=0)
+        angles = np.arctan2(arr[:, 1] - center[1], arr[:, 0] - center[0])
+        angles = np.where(angles < 0, angles + 2 * math.pi, angles)
+        
+        # 角度でソートし、等間隔で角を選択
+        order = np.argsort(angles, kind="stable")
+        step = len(arr) // num_corners
+        picks = order[(np.arange(num_corners) * step) % len(arr)]
+        corners = [tuple(p) for p in arr[picks].tolist()]
         
         # 閉じた多角形にする
         if corners and corners[0] != corners[-1]:
@@ -738,12 +931,14 @@ class UnfoldEngine:
             
         return corners
     
-    def _detect_polygon_corners(self, points_2d: List[Tuple[float, float]]) -> int:
+    def _detect_polygon_corners(self, points_2d: List[Tuple[float, float]],
+                                hull: Optional[np.ndarray] = None) -> int:
         """
         点群から多角形の角数を検出。
         
         Args:
             points_2d: 2D点群
+            hull: 計算済みの凸包頂点インデックス（省略時はここで計算）
         
         Returns:
             int: 検出された角数（3-12の範囲）
@@ -753,10 +948,10 @@ class UnfoldEngine:
         
         try:
             points_array = np.array(points_2d)
-            hull = ConvexHull(points_array)
+            hull_vertices = hull if hull is not None else convex_hull_2d(points_array)
             
             # 凸包の頂点数が角数
-            num_corners = len(hull.vertices)
+            num_corners = len(hull_vertices)
             
             # 3-12角形の範囲に制限
             return max(3, min(12, num_corners))
@@ -765,50 +960,25 @@ class UnfoldEngine:
             estimated_corners = max(3, min(12, len(points_2d) // 5))
             return estimated_corners
     
-    def _is_pentagonal_boundary(self, points_2d: List[Tuple[float, float]]) -> bool:
-        """
-        境界線が五角形かどうかを判定。
-        
-        Args:
-            points_2d: 2D点群
-        
-        Returns:
-            bool: 五角形の場合True
-        """
-        if len(points_2d) < 10:  # 最低でも10点は必要
-            return False
-        
-        # 凸包を計算して5点になるかチェック
-        try:
-            points_array = np.array(points_2d)
-            hull = ConvexHull(points_array)
-            
-            # 凸包の頂点が5個なら五角形
-            return len(hull.vertices) == 5
-        except:
-            return False
-    
-    def _extract_pentagon_corners(self, points_2d: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    def _extract_pentagon_corners(self, points_2d: List[Tuple[float, float]],
+                                  hull: Optional[np.ndarray] = None) -> List[Tuple[float, float]]:
         """
         点群から五角形の5つの角を抽出。
         
         Args:
             points_2d: 2D点群
+            hull: 計算済みの凸包頂点インデックス（省略時はここで計算）
         
         Returns:
             List[Tuple[float, float]]: 五角形の角
         """
         try:
             points_array = np.array(points_2d)
-            hull = ConvexHull(points_array)
+            hull_vertices = hull if hull is not None else convex_hull_2d(points_array)
             
-            if len(hull.vertices) == 5:
-                # 凸包の頂点を時計回りに並び替え
-                pentagon_corners = [tuple(points_array[i]) for i in hull.vertices]
-                pentagon_corners = self._sort_points_clockwise(pentagon_corners)
-                # 閉じた五角形にする
-                pentagon_corners.append(pentagon_corners[0])
-                return pentagon_corners
+            if len(hull_vertices) == 5:
+                # 凸包の頂点を時計回りに並べ、閉じた五角形にする
+                return self._closed_sorted_corners(points_array[hull_vertices])
             else:
                 # フォールバック：角度ベースで5つの角を抽出
                 return self._extract_corners_by_angle(points_2d, 5)
@@ -832,10 +1002,11 @@ class UnfoldEngine:
             
         # 等間隔で点を選択
         step = len(points_2d) // max_points
-        return [points_2d[i] for i in range(0, len(points_2d), step)]
+        return points_2d[::step]
     
     def _extract_cylindrical_face_2d(self, face_idx: int, axis: np.ndarray, center: np.ndarray, 
-                                    radius: float) -> List[List[Tuple[float, float]]]:
+                                    radius: float,
+                                    ref_dir: Optional[np.ndarray] = None) -> List[List[Tuple[float, float]]]:
         """
         円筒面の正確な2D形状を抽出。
         
@@ -844,6 +1015,7 @@ class UnfoldEngine:
             axis: 軸ベクトル
             center: 中心点
             radius: 半径
+            ref_dir: 計算済みの基準方向（指定時はaxisが単位ベクトルであること）
         
         Returns:
             List[List[Tuple[float, float]]]: 2Dポリゴンのリスト
@@ -852,10 +1024,13 @@ class UnfoldEngine:
         polygons_2d = []
         
         # 各境界線を円筒展開
-        for boundary in face_data["boundary_curves"]:
+        for boundary in self._boundary_arrays(face_data):
             if len(boundary) >= 3:
                 # 3D境界点を円筒展開
-                unfolded_boundary = self._unfold_cylindrical_points_accurate(boundary, axis, center, radius)
+                unfolded_boundary = self._memoized_boundary_unfold(
+                    "cylinder", np.append(axis, radius), boundary, center,
+                    lambda: self._unfold_cylindrical_points_accurate(boundary, axis, center, radius, ref_dir)
+                )
                 
                 # 有効な2D形状の場合のみ追加
                 if len(unfolded_boundary) >= 3:
@@ -865,7 +1040,8 @@ class UnfoldEngine:
     
     def _unfold_cylindrical_points_accurate(self, points_3d: List[Tuple[float, float, float]], 
                                            axis: np.ndarray, center: np.ndarray, 
-                                           radius: float) -> List[Tuple[float, float]]:
+                                           radius: float,
+                                           ref_dir: Optional[np.ndarray] = None) -> np.ndarray:
         """
         3D点群を円筒面から正確に展開（改良版）。
         
@@ -874,55 +1050,25 @@ class UnfoldEngine:
             axis: 軸ベクトル
             center: 中心点
             radius: 半径
+            ref_dir: 計算済みの基準方向（指定時はaxisが単位ベクトルであること）
         
         Returns:
-            List[Tuple[float, float]]: 展開された2D点群
+            np.ndarray: 展開された2D点群 (N, 2)
         """
         if len(points_3d) < 3:
             return []
         
-        # 軸の単位ベクトル化
-        axis = axis / np.linalg.norm(axis)
-        points_2d = []
+        # 軸の単位ベクトル化と基準方向ベクトル設定
+        if ref_dir is None:
+            axis, ref_dir = self._axis_reference_frame(axis)
         
-        # 基準方向ベクトル設定
-        if abs(axis[2]) < 0.9:
-            ref_dir = np.cross(axis, [0, 0, 1])
-        else:
-            ref_dir = np.cross(axis, [1, 0, 0])
-        ref_dir = ref_dir / np.linalg.norm(ref_dir)
-        
-        for point in points_3d:
-            point_vec = np.array(point) - center
-            
-            # 軸方向成分（Y座標）
-            y = np.dot(point_vec, axis)
-            
-            # 軸に垂直な成分
-            radial_vec = point_vec - y * axis
-            radial_dist = np.linalg.norm(radial_vec)
-            
-            # 角度計算（X座標）
-            if radial_dist > 1e-6:
-                # 正確な角度計算
-                cos_angle = np.dot(radial_vec, ref_dir) / radial_dist
-                cos_angle = np.clip(cos_angle, -1.0, 1.0)  # 数値エラー対策
-                
-                # 符号を決定するための外積
-                cross_product = np.cross(ref_dir, radial_vec)
-                sign = 1 if np.dot(cross_product, axis) >= 0 else -1
-                
-                angle = sign * math.acos(cos_angle)
-                x = angle * radius
-            else:
-                x = 0.0
-            
-            points_2d.append((x, y))
-        
-        return points_2d
+        # 角度（X座標）と軸方向成分（Y座標）を全点まとめて計算
+        return unroll_cylinder(as_points_array(points_3d), np.asarray(center, dtype=np.float64),
+                               axis, ref_dir, radius)
     
     def _extract_conical_face_2d(self, face_idx: int, apex: np.ndarray, axis: np.ndarray, 
-                                radius: float, semi_angle: float) -> List[List[Tuple[float, float]]]:
+                                radius: float, semi_angle: float,
+                                ref_dir: Optional[np.ndarray] = None) -> List[List[Tuple[float, float]]]:
         """
         円錐面の正確な2D形状を抽出。
         
@@ -932,6 +1078,7 @@ class UnfoldEngine:
             axis: 軸ベクトル
             radius: 半径
             semi_angle: 半角
+            ref_dir: 計算済みの基準方向（指定時はaxisが単位ベクトルであること）
         
         Returns:
             List[List[Tuple[float, float]]]: 2Dポリゴンのリスト
@@ -940,10 +1087,13 @@ class UnfoldEngine:
         polygons_2d = []
         
         # 各境界線を円錐展開
-        for boundary in face_data["boundary_curves"]:
+        for boundary in self._boundary_arrays(face_data):
             if len(boundary) >= 3:
                 # 3D境界点を円錐展開
-                unfolded_boundary = self._unfold_conical_points_accurate(boundary, apex, axis, radius, semi_angle)
+                unfolded_boundary = self._memoized_boundary_unfold(
+                    "cone", np.append(axis, semi_angle), boundary, apex,
+                    lambda: self._unfold_conical_points_accurate(boundary, apex, axis, radius, semi_angle, ref_dir)
+                )
                 
                 # 有効な2D形状の場合のみ追加
                 if len(unfolded_boundary) >= 3:
@@ -953,7 +1103,8 @@ class UnfoldEngine:
     
     def _unfold_conical_points_accurate(self, points_3d: List[Tuple[float, float, float]], 
                                        apex: np.ndarray, axis: np.ndarray, 
-                                       radius: float, semi_angle: float) -> List[Tuple[float, float]]:
+                                       radius: float, semi_angle: float,
+                                       ref_dir: Optional[np.ndarray] = None) -> np.ndarray:
         """
         3D点群を円錐面から正確に扇形展開。
         
@@ -963,64 +1114,21 @@ class UnfoldEngine:
             axis: 軸ベクトル
             radius: 半径
             semi_angle: 半角
+            ref_dir: 計算済みの基準方向（指定時はaxisが単位ベクトルであること）
         
         Returns:
-            List[Tuple[float, float]]: 展開された2D点群
+            np.ndarray: 展開された2D点群 (N, 2)
         """
         if len(points_3d) < 3:
             return []
         
-        axis = axis / np.linalg.norm(axis)
-        points_2d = []
-        
-        # 円錐の母線長
-        slant_height = radius / math.sin(semi_angle) if semi_angle > 0 else radius
+        # 軸の単位ベクトル化と基準方向ベクトル
+        if ref_dir is None:
+            axis, ref_dir = self._axis_reference_frame(axis)
         
-        for point in points_3d:
-            point_vec = np.array(point) - apex
-            
-            # 頂点からの距離
-            distance = np.linalg.norm(point_vec)
-            
-            if distance > 1e-6:
-                # 軸からの角度
-                cos_angle = np.dot(point_vec, axis) / distance
-                cos_angle = np.clip(cos_angle, -1.0, 1.0)  # 数値エラー対策
-                angle_from_axis = math.acos(cos_angle)
-                
-                # 展開図での半径（円錐の母線に沿った距離）
-                r = distance * math.cos(angle_from_axis)
-                
-                # 展開図での角度（円錐の開きを考慮）
-                if abs(semi_angle) > 1e-6:
-                    # 基準方向ベクトル
-                    if abs(axis[2]) < 0.9:
-                        ref_dir = np.cross(axis, [0, 0, 1])
-                    else:
-                        ref_dir = np.cross(axis, [1, 0, 0])
-                    ref_dir = ref_dir / np.linalg.norm(ref_dir)
-                    
-                    # 周方向の角度
-                    radial_vec = point_vec - np.dot(point_vec, axis) * axis
-                    if np.linalg.norm(radial_vec) > 1e-6:
-                        radial_vec = radial_vec / np.linalg.norm(radial_vec)
-                        theta = math.atan2(np.dot(radial_vec, np.cross(axis, ref_dir)), 
-                                         np.dot(radial_vec, ref_dir))
-                        # 円錐展開における角度スケール
-                        theta = theta * math.sin(semi_angle)
-                    else:
-                        theta = 0.0
-                else:
-                    theta = 0.0
-                
-                x = r * math.cos(theta)
-                y = r * math.sin(theta)
-            else:
-                x, y = 0.0, 0.0
-            
-            points_2d.append((x, y))
-        
-        return points_2d
+        # 展開図での半径・周方向角度を全点まとめて計算
+        return unroll_cone(as_points_array(points_3d), np.asarray(apex, dtype=np.float64),
+                           axis, ref_dir, semi_angle)
     
     def _is_circular_face(self, face_data: Dict) -> bool:
         """
@@ -1080,7 +1188,7 @@ class UnfoldEngine:
             if face_idx < len(self.faces_data):
                 face_data = self.faces_data[face_idx]
                 
-                for boundary in face_data["boundary_curves"]:
+                for boundary in self._boundary_arrays(face_data):
                     if len(boundary) >= 2:
                         # 簡易タブ（矩形）を生成
                         start_point = boundary[0]
@@ -1146,7 +1254,25 @@ class UnfoldEngine:
         Returns:
             bool: 隣接している場合True
         """
-        centroid1 = np.array(self.faces_data[face_idx1]["centroid"])
-        centroid2 = np.array(self.faces_data[face_idx2]["centroid"])
-        distance = np.linalg.norm(centroid1 - centroid2)
-        return distance < threshold
\ No newline at end of file
+        # 平方根を取らずに二乗距離で比較
+        delta = np.subtract(self.faces_data[face_idx1]["centroid"], self.faces_data[face_idx2]["centroid"])
+        return float(delta @ delta) < threshold * threshold
+
+
+# --- プロセスプール用ワーカー ---
+# 各ワーカープロセスは初期化時に面データを受け取ったUnfoldEngineを1つ保持する。
+_worker_engine: Optional[UnfoldEngine] = None
+
+
+def _init_unfold_worker(faces_data: List[Dict], edges_data: List[Dict],
+                        scale_factor: float, tab_width: float):
+    """ワーカープロセスの初期化（面データを一度だけ受け取る）"""
+    global _worker_engine
+    _worker_engine = UnfoldEngine(scale_factor=scale_factor, tab_width=tab_width)
+    _worker_engine.set_geometry_data(faces_data, edges_data)
+
+
+def _unfold_group_worker(task: Tuple[int, List[int]]) -> Optional[Dict]:
+    """ワーカープロセスで単一グループを展開"""
+    group_idx, face_indices = task
+    return _worker_engine._unfold_group_safe(group_idx, face_indices)
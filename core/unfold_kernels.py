@@ -0,0 +1,186 @@
+"""
+展開処理の数値計算カーネル。
+点ごとのPythonループを避け、頂点配列に対して一括でNumPy演算を行う。
+"""
+
+import numpy as np
+
+# 軸上・頂点上の点とみなす距離（1e-6）の二乗。平方根を取らずに比較する
+DEGENERATE_DIST_SQ = 1e-12
+
+
+def as_points_array(points, dim: int = 3) -> np.ndarray:
+    """
+    点列を連続した(N, dim)のfloat64配列に変換。
+    
+    Args:
+        points: 点のリスト（タプル/リスト）または配列
+        dim: 座標の次元
+    
+    Returns:
+        np.ndarray: (N, dim)の配列
+    """
+    return np.ascontiguousarray(np.asarray(points, dtype=np.float64).reshape(-1, dim))
+
+
+def apply_affine_2d(verts_xyz: np.ndarray, R: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    3D頂点を平行移動した後、2×3の回転行列で2D座標系に変換。
+    
+    Args:
+        verts_xyz: (N, 3)の頂点配列
+        R: (2, 3)の変換行列（行が平面のu軸・v軸）
+        t: (3,)の原点（各頂点から差し引かれる）
+    
+    Returns:
+        np.ndarray: (N, 2)の2D座標配列
+    """
+    return (verts_xyz - t) @ R.T
+
+
+def plane_basis(normal: np.ndarray):
+    """
+    法線に直交する正規直交基底(u, v)を求める。
+    補助ベクトルには法線の成分の絶対値が最小の座標軸を選ぶため、
+    しきい値による分岐なしで常に法線と最も直交に近い軸が使われる。
+    
+    Args:
+        normal: (3,)の単位法線ベクトル
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (u, v)の単位ベクトル
+    """
+    aux = np.zeros(3)
+    aux[int(np.argmin(np.abs(normal)))] = 1.0
+    u = np.cross(normal, aux)
+    u /= np.linalg.norm(u)
+    v = np.cross(normal, u)
+    return u, v
+
+
+def _axis_frame(points: np.ndarray, origin: np.ndarray, axis: np.ndarray, ref_dir: np.ndarray):
+    """
+    軸基準の局所座標（基準方向・直交方向・軸方向成分）を一括計算。
+    """
+    rel = points - origin
+    side_dir = np.cross(axis, ref_dir)
+    basis = np.vstack((ref_dir, side_dir, axis))
+    local = rel @ basis.T
+    return rel, local
+
+
+def unroll_cylinder(points: np.ndarray, center: np.ndarray, axis: np.ndarray,
+                    ref_dir: np.ndarray, radius: float) -> np.ndarray:
+    """
+    円筒面上の点群を(周長, 軸方向)の2D座標に展開。
+    
+    Args:
+        points: (N, 3)の点配列
+        center: 円筒軸上の点
+        axis: 単位軸ベクトル
+        ref_dir: 軸に直交する単位基準方向
+        radius: 半径
+    
+    Returns:
+        np.ndarray: (N, 2)の展開座標
+    """
+    _, local = _axis_frame(points, center, axis, ref_dir)
+    radial_sq = local[:, 0] ** 2 + local[:, 1] ** 2
+    on_surface = radial_sq > DEGENERATE_DIST_SQ
+    
+    # 継ぎ目(±π)をまたぐ境界でも角度が連続するように展開
+    if on_surface.all():
+        # 通常は全点が曲面上にあるため、マスクによる部分配列のコピーを省く
+        theta = np.unwrap(np.arctan2(local[:, 1], local[:, 0]))
+    else:
+        theta = np.zeros(len(points))
+        if on_surface.any():
+            theta[on_surface] = np.unwrap(np.arctan2(local[on_surface, 1], local[on_surface, 0]))
+    
+    return np.column_stack((theta * radius, local[:, 2]))
+
+
+def unroll_cone(points: np.ndarray, apex: np.ndarray, axis: np.ndarray,
+                ref_dir: np.ndarray, semi_angle: float) -> np.ndarray:
+    """
+    円錐面上の点群を扇形の2D座標に展開。
+    
+    Args:
+        points: (N, 3)の点配列
+        apex: 円錐の頂点
+        axis: 単位軸ベクトル
+        ref_dir: 軸に直交する単位基準方向
+        semi_angle: 半角（ラジアン）
+    
+    Returns:
+        np.ndarray: (N, 2)の展開座標
+    """
+    _, local = _axis_frame(points, apex, axis, ref_dir)
+    # 局所座標系は正規直交なので、頂点からの距離は局所座標のノルムに等しい
+    radial_sq = local[:, 0] ** 2 + local[:, 1] ** 2
+    off_apex = radial_sq + local[:, 2] ** 2 > DEGENERATE_DIST_SQ
+    
+    # 展開図での半径（軸方向への射影長）
+    r = np.where(off_apex, local[:, 2], 0.0)
+    
+    theta = np.zeros(len(points))
+    if abs(semi_angle) > 1e-6:
+        has_angle = off_apex & (radial_sq > DEGENERATE_DIST_SQ)
+        # 円錐展開における角度スケール
+        if has_angle.all():
+            theta = np.unwrap(np.arctan2(local[:, 1], local[:, 0])) * np.sin(semi_angle)
+        elif has_angle.any():
+            angles = np.unwrap(np.arctan2(local[has_angle, 1], local[has_angle, 0]))
+            theta[has_angle] = angles * np.sin(semi_angle)
+    
+    return np.column_stack((r * np.cos(theta), r * np.sin(theta)))
+
+
+def convex_hull_2d(points: np.ndarray, rel_tol: float = 1e-9) -> np.ndarray:
+    """
+    Andrewのモノトーンチェイン法による2D凸包。
+    小さな点群ではQhullの初期化コストよりも高速。
+    
+    Args:
+        points: (N, 2)の点配列
+        rel_tol: 共線判定の相対許容誤差（点群の広がりの二乗に対する比）
+    
+    Returns:
+        np.ndarray: 凸包頂点のインデックス（反時計回り、共線点は含まない）
+    
+    Raises:
+        ValueError: 点群が退化していて凸包が作れない場合
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(pts) < 3:
+        raise ValueError("凸包の計算には3点以上が必要です")
+    
+    # x昇順（同値はy昇順）に並べ替え
+    order = np.lexsort((pts[:, 1], pts[:, 0]))
+    xs = pts[:, 0].tolist()
+    ys = pts[:, 1].tolist()
+    
+    # 数値誤差で直線上の点が頂点として残らないよう、規模に応じた閾値で共線とみなす
+    extent = np.ptp(pts, axis=0)
+    tol = rel_tol * float(extent @ extent)
+    
+    def build_chain(indices):
+        chain = []
+        for i in indices:
+            while len(chain) >= 2:
+                o, a = chain[-2], chain[-1]
+                cross = (xs[a] - xs[o]) * (ys[i] - ys[o]) - (ys[a] - ys[o]) * (xs[i] - xs[o])
+                if cross > tol:
+                    break
+                chain.pop()
+            chain.append(i)
+        return chain
+    
+    order_list = order.tolist()
+    lower = build_chain(order_list)
+    upper = build_chain(reversed(order_list))
+    hull = lower[:-1] + upper[:-1]
+    
+    if len(hull) < 3:
+        raise ValueError("点群が一直線上にあるため凸包を計算できません")
+    return np.asarray(hull, dtype=np.int64)
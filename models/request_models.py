@@ -20,6 +20,8 @@ class BrepPapercraftRequest(BaseModel):
     layout_mode: str = "canvas"  # "canvas" (フリーキャンバス) or "paged" (ページ分割)
     page_format: str = "A4"  # ページフォーマット: A4, A3, Letter
     page_orientation: str = "portrait"  # ページ向き: portrait (縦) or landscape (横)
+    # ═══ 処理オプション：展開処理の実行方式 ═══
+    parallel_unfold: bool = False  # グループ数が多い場合にプロセス並列で展開するか
 
 
 class CityGMLConversionRequest(BaseModel):
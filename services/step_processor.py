@@ -1,40 +1,22 @@
 import os
 import tempfile
 import uuid
-import base64
-import json
 import math
 import time
 from typing import List, Optional, Dict, Any, Union, Tuple
 import numpy as np
-from scipy.spatial import ConvexHull
-from scipy.spatial.distance import cdist
-import networkx as nx
 import io
 
-from config import OCCT_AVAILABLE
+from config import OCCT_AVAILABLE, GEOMETRY_CACHE_DIR, GEOMETRY_CACHE_MAX_ENTRIES
 from core.file_loaders import FileLoader
-from core.geometry_analyzer import GeometryAnalyzer
+from core.geometry_analyzer import GeometryAnalyzer, build_face_arrays, build_edge_arrays
 from core.unfold_engine import UnfoldEngine
 from core.layout_manager import LayoutManager
 from core.svg_exporter import SVGExporter
+from utils.geometry_cache import CACHE_FORMAT_VERSION, GeometryCache, compute_content_hash
 
-if OCCT_AVAILABLE:
-    from OCC.Core.BRep import BRep_Builder, BRep_Tool
-    from OCC.Core import BRepTools
-    from OCC.Core.TopExp import TopExp_Explorer
-    from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX, TopAbs_WIRE
-    from OCC.Core.BRepGProp import BRepGProp_Face
-    from OCC.Core import BRepGProp
-    from OCC.Core.BRepAdaptor import BRepAdaptor_Surface, BRepAdaptor_Curve
-    from OCC.Core.GeomLProp import GeomLProp_SLProps
-    from OCC.Core.GeomAbs import GeomAbs_Plane, GeomAbs_Cylinder, GeomAbs_Cone, GeomAbs_Sphere
-    from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
-    from OCC.Core.GProp import GProp_GProps
-    from OCC.Core.TopoDS import TopoDS_Shape, TopoDS_Face, TopoDS_Edge, TopoDS_Vertex
-    from OCC.Core.gp import gp_Pnt, gp_Vec, gp_Dir, gp_Pln, gp_Cylinder, gp_Cone, gp_Trsf, gp_Ax1, gp_Ax2, gp_Ax3
-    from OCC.Core.Geom import Geom_Surface, Geom_Plane, Geom_CylindricalSurface, Geom_ConicalSurface
-    from OCC.Core.Standard import Standard_Failure
+# 面タイプ別の面数を表す統計キー（mode="stats_only"の解析でも更新される）
+FACE_STAT_KEYS = ("total_faces", "planar_faces", "cylindrical_faces", "conical_faces", "other_faces")
 
 
 class StepUnfoldGenerator:
@@ -62,6 +44,13 @@ class StepUnfoldGenerator:
         # ファイル情報の同期用
         self.last_file_info = None
         
+        # 幾何解析〜展開結果のキャッシュ（読み込んだバイト列のハッシュがキー）
+        self._content_hash: Optional[str] = None
+        self.geometry_cache = GeometryCache(
+            cache_dir=GEOMETRY_CACHE_DIR or None,
+            max_entries=GEOMETRY_CACHE_MAX_ENTRIES
+        )
+        
         # 幾何学解析クラス
         self.geometry_analyzer = GeometryAnalyzer()
         
@@ -118,6 +107,8 @@ class StepUnfoldGenerator:
         """
         ファイル拡張子に応じて適切な読み込み関数を呼び出す。
         """
+        # パス指定の読み込みはキャッシュ対象外
+        self._content_hash = None
         # FileLoaderクラスのload_from_fileメソッドを使用
         result = self.file_loader.load_from_file(file_path)
         # 読み込んだ形状を自分のインスタンスに設定
@@ -136,6 +127,7 @@ class StepUnfoldGenerator:
         バイト列からCADデータを読み込む（API経由アップロード対応）。
         """
         result = self.file_loader.load_from_bytes(file_content, file_ext)
+        self._content_hash = compute_content_hash(file_content)
         # 読み込んだ形状を自分のインスタンスに設定
         self.solid_shape = self.file_loader.solid_shape
         # last_file_infoを同期
@@ -148,32 +140,54 @@ class StepUnfoldGenerator:
         無効なBREPの場合は、パラメータから立方体を生成する。
         """
         result = self.file_loader.load_brep_from_bytes(file_content)
+        self._content_hash = compute_content_hash(file_content)
         # 読み込んだ形状を自分のインスタンスに設定
         self.solid_shape = self.file_loader.solid_shape
         # last_file_infoを同期
         self.last_file_info = self.file_loader.last_file_info
         return result
 
-    def analyze_brep_topology(self):
+    def analyze_brep_topology(self, mode: str = "full") -> Dict:
         """
         BREPソリッドのトポロジ構造を詳細解析。
         面・エッジ・頂点の幾何特性を抽出し、展開戦略を決定。
+        
+        Args:
+            mode: "full" または "stats_only"（面タイプ別の面数のみ集計し、展開用データは作らない）
+        
+        Returns:
+            Dict: 更新後の統計情報（どちらのモードでも同じ形式）
         """
         if self.solid_shape is None:
             raise ValueError("BREPデータが読み込まれていません")
         
         # 幾何学解析クラスに委譲
-        self.geometry_analyzer.analyze_brep_topology(self.solid_shape)
+        self.geometry_analyzer.analyze_brep_topology(self.solid_shape, mode=mode)
+        
+        if mode == "stats_only":
+            self._sync_face_stats()
+            return self.stats
+        
+        # 解析結果は新しいリストとして生成されるため参照を同期
+        self.faces_data = self.geometry_analyzer.faces_data
+        self.edges_data = self.geometry_analyzer.edges_data
         
         # 統計情報更新
-        self.stats["total_faces"] = self.geometry_analyzer.stats["total_faces"]
-        self.stats["planar_faces"] = self.geometry_analyzer.stats["planar_faces"]
-        self.stats["cylindrical_faces"] = self.geometry_analyzer.stats["cylindrical_faces"]
-        self.stats["conical_faces"] = self.geometry_analyzer.stats["conical_faces"]
-        self.stats["other_faces"] = self.geometry_analyzer.stats["other_faces"]
+        self._sync_face_stats()
         
         # 展開エンジンに幾何学データを設定
-        self.unfold_engine.set_geometry_data(self.faces_data, self.edges_data)
+        self.unfold_engine.set_geometry_data(
+            self.faces_data, self.edges_data,
+            self.geometry_analyzer.face_arrays, self.geometry_analyzer.edge_arrays
+        )
+        return self.stats
+
+    def _sync_face_stats(self):
+        """
+        幾何学解析クラスの面数統計を自身の統計情報に反映。
+        """
+        for key in FACE_STAT_KEYS:
+            self.stats[key] = self.geometry_analyzer.stats[key]
 
     def group_faces_for_unfolding(self, max_faces: int = 20) -> List[List[int]]:
         """
@@ -212,6 +226,46 @@ class StepUnfoldGenerator:
         return self.layout_manager.layout_unfolded_groups(unfolded_groups)
 
 
+    def _geometry_cache_key(self, max_faces: int) -> Optional[str]:
+        """
+        展開結果キャッシュのキーを生成。バイト列から読み込んでいない場合はNone。
+        形式バージョンを含め、展開処理を変更したデプロイ後に古い結果を使わないようにする。
+        """
+        if self._content_hash is None:
+            return None
+        return f"v{CACHE_FORMAT_VERSION}_{self._content_hash}_{max_faces}"
+
+    def _restore_cached_geometry(self, cached: Dict) -> List[Dict]:
+        """
+        キャッシュ済みの解析・展開結果を各コンポーネントに復元。
+        
+        Returns:
+            List[Dict]: 展開済みグループのリスト
+        """
+        self.geometry_analyzer.faces_data = cached["faces_data"]
+        self.geometry_analyzer.edges_data = cached["edges_data"]
+        self.geometry_analyzer.face_arrays = cached.get("face_arrays") or build_face_arrays(cached["faces_data"])
+        self.geometry_analyzer.edge_arrays = cached.get("edge_arrays") or build_edge_arrays(cached["edges_data"])
+        self.geometry_analyzer.stats.update(cached["analyzer_stats"])
+        self.faces_data = self.geometry_analyzer.faces_data
+        self.edges_data = self.geometry_analyzer.edges_data
+        
+        self._sync_face_stats()
+        
+        self.unfold_engine.set_geometry_data(
+            self.faces_data, self.edges_data,
+            self.geometry_analyzer.face_arrays, self.geometry_analyzer.edge_arrays
+        )
+        self.unfold_groups = cached["unfold_groups"]
+        self.unfold_engine.unfold_groups = self.unfold_groups
+        return cached["unfolded_groups"]
+
+    def clear_cache(self) -> None:
+        """
+        展開結果キャッシュを全削除する。
+        """
+        self.geometry_cache.clear()
+
     def export_to_svg(self, placed_groups: List[Dict], output_path: str) -> str:
         """
         配置済み展開図をSVG形式で出力。
@@ -284,6 +338,7 @@ class StepUnfoldGenerator:
             # UnfoldEngine、LayoutManager、SVGExporterのscale_factorを更新
             self.unfold_engine.scale_factor = self.scale_factor
             self.unfold_engine.tab_width = self.tab_width
+            self.unfold_engine.parallel_enabled = request.parallel_unfold
             self.layout_manager.scale_factor = self.scale_factor
             self.svg_exporter.scale_factor = self.scale_factor
             self.svg_exporter.tab_width = self.tab_width
@@ -291,14 +346,34 @@ class StepUnfoldGenerator:
             self.svg_exporter.page_format = self.page_format
             self.svg_exporter.page_orientation = self.page_orientation
             
-            # 1. BREPトポロジ解析
-            self.analyze_brep_topology()
-            
-            # 2. 展開可能面のグルーピング
-            self.group_faces_for_unfolding(request.max_faces)
+            # 同一ファイル・同一max_facesの解析結果があれば1〜3を省略
+            cache_key = self._geometry_cache_key(request.max_faces)
+            cached = self.geometry_cache.get(cache_key) if cache_key else None
             
-            # 3. 各グループの2D展開
-            unfolded_groups = self.unfold_face_groups()
+            if cached is not None:
+                print(f"展開結果キャッシュを使用: {cache_key}")
+                unfolded_groups = self._restore_cached_geometry(cached)
+            else:
+                # 1. BREPトポロジ解析
+                self.analyze_brep_topology()
+                
+                # 2. 展開可能面のグルーピング
+                self.group_faces_for_unfolding(request.max_faces)
+                
+                # 3. 各グループの2D展開
+                unfolded_groups = self.unfold_face_groups()
+                
+                # レイアウト処理でグループが書き換えられる前に保存する
+                if cache_key:
+                    self.geometry_cache.set(cache_key, {
+                        "faces_data": self.faces_data,
+                        "edges_data": self.edges_data,
+                        "face_arrays": self.geometry_analyzer.face_arrays,
+                        "edge_arrays": self.geometry_analyzer.edge_arrays,
+                        "analyzer_stats": dict(self.geometry_analyzer.stats),
+                        "unfold_groups": self.unfold_groups,
+                        "unfolded_groups": unfolded_groups
+                    })
             
             # 4. レイアウトモードに応じた配置
             if self.layout_mode == "paged":
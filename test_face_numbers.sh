@@ -5,7 +5,7 @@
 echo "面番号機能のテストを開始します..."
 
 # デバッグファイルから最初のSTEPファイルを使用
-STEP_FILE=$(ls core/debug_files/*.step 2>/dev/null | head -1)
+STEP_FILE=$(find core/debug_files -maxdepth 1 -name '*.step' -print -quit 2>/dev/null)
 
 if [ -z "$STEP_FILE" ]; then
     echo "エラー: テスト用STEPファイルが見つかりません"
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+点群間の二乗距離計算（pairwise_sqdist）のテストケース
+差分を直接二乗して足す素朴な計算と一致するか、原点から遠い座標でも精度が保たれるかを検証
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.fast_dist import pairwise_sqdist
+
+
+def _naive_sqdist(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """差分ベクトルから直接求める二乗距離行列（比較用）"""
+    diff = A[:, None, :] - B[None, :, :]
+    return (diff ** 2).sum(axis=-1)
+
+
+def test_matches_naive():
+    """原点付近の点群で素朴な計算と一致するかのテスト"""
+    rng = np.random.default_rng(0)
+    A = rng.uniform(-50, 50, (40, 3))
+    B = rng.uniform(-50, 50, (25, 3))
+
+    error_self = np.abs(pairwise_sqdist(A) - _naive_sqdist(A, A)).max()
+    error_pair = np.abs(pairwise_sqdist(A, B) - _naive_sqdist(A, B)).max()
+    print(f"原点付近の最大誤差: 自己 {error_self:.3e}, 2点群 {error_pair:.3e}")
+    assert error_self < 1e-9 and error_pair < 1e-9, "素朴な計算と一致しません"
+
+
+def test_large_offset():
+    """原点から遠い座標（大きな組立図の重心など）でも精度が保たれるかのテスト"""
+    rng = np.random.default_rng(1)
+    for offset in (1e6, 1e7):
+        A = rng.uniform(0, 100, (40, 3)) + offset
+        B = rng.uniform(0, 100, (25, 3)) + offset
+
+        error_self = np.abs(pairwise_sqdist(A) - _naive_sqdist(A, A)).max()
+        error_pair = np.abs(pairwise_sqdist(A, B) - _naive_sqdist(A, B)).max()
+        print(f"オフセット {offset:.0e} の最大誤差: 自己 {error_self:.3e}, 2点群 {error_pair:.3e}")
+        assert error_self < 1e-6 and error_pair < 1e-6, f"オフセット {offset:.0e} で精度が落ちています"
+
+
+def test_adjacency_threshold_at_offset():
+    """閾値付近の隣接判定が座標のオフセットで変わらないかのテスト"""
+    threshold_sq = 10.0 ** 2
+    # 閾値をわずかに下回る・上回る距離の点対
+    base = np.array([[0.0, 0.0, 0.0], [9.9999, 0.0, 0.0], [0.0, 10.0001, 0.0]])
+    expected = _naive_sqdist(base, base) < threshold_sq
+
+    for offset in (0.0, 1e6, 1e7):
+        result = pairwise_sqdist(base + offset) < threshold_sq
+        print(f"オフセット {offset:.0e} の隣接判定: {result[0, 1]}, {result[0, 2]} (期待値: True, False)")
+        assert np.array_equal(result, expected), f"オフセット {offset:.0e} で隣接判定が変わりました"
+
+
+def test_self_distance_properties():
+    """自己距離行列の対角が0で、（丸め誤差の範囲で）対称かつ非負かのテスト"""
+    rng = np.random.default_rng(2)
+    D = pairwise_sqdist(rng.uniform(-1e3, 1e3, (30, 3)))
+
+    print(f"対角の最大値: {np.abs(np.diag(D)).max()}, 最小値: {D.min():.3e}")
+    assert np.all(np.diag(D) == 0.0), "対角が0ではありません"
+    assert np.allclose(D, D.T, rtol=0.0, atol=1e-9), "距離行列が対称ではありません"
+    assert D.min() >= 0.0, "負の二乗距離があります"
+
+
+def test_empty_input():
+    """空の点群で空の行列を返すかのテスト"""
+    result = pairwise_sqdist(np.empty((0, 3)))
+    print(f"空入力の結果形状: {result.shape} (期待値: (0, 0))")
+    assert result.shape == (0, 0), "空入力の形状が不正です"
+
+
+def main():
+    """全テストを実行"""
+    print("=" * 50)
+    print("二乗距離計算テスト開始")
+    print("=" * 50)
+
+    try:
+        test_matches_naive()
+        test_large_offset()
+        test_adjacency_threshold_at_offset()
+        test_self_distance_properties()
+        test_empty_input()
+
+        print("\n" + "=" * 50)
+        print("✅ すべてのテストが成功しました")
+        print("=" * 50)
+
+    except AssertionError as e:
+        print(f"\n❌ テスト失敗: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラー発生: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+折り線判定（UnfoldEngine.classify_fold_edges）のテストケース
+面の向き（反転面）の補正、曲面を含むエッジの除外、エッジごとの素朴な判定との一致を検証
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.geometry_analyzer import build_edge_arrays, build_face_arrays
+from core.unfold_engine import UnfoldEngine
+
+
+def _plane_face(index, normal, reversed_=False):
+    """平面の面データ。normal_vectorは曲面（平面）の軸方向で、反転面では内向きになる"""
+    return {
+        "index": index,
+        "centroid": [0.0, 0.0, 0.0],
+        "surface_type": "plane",
+        "normal_vector": list(normal),
+        "reversed": reversed_,
+        "unfoldable": True,
+    }
+
+
+def _cylinder_face(index):
+    """円筒面の面データ（法線は一定でないため持たない）"""
+    return {
+        "index": index,
+        "centroid": [0.0, 0.0, 0.0],
+        "surface_type": "cylinder",
+        "normal_vector": None,
+        "cylinder_radius": 5.0,
+        "reversed": False,
+        "unfoldable": True,
+    }
+
+
+def _engine(faces_data, adjacency):
+    """面データとエッジごとの隣接面リストから展開エンジンを構築"""
+    edges_data = [{"index": i, "adjacent_faces": list(adj)} for i, adj in enumerate(adjacency)]
+    engine = UnfoldEngine()
+    engine.set_geometry_data(faces_data, edges_data,
+                             build_face_arrays(faces_data), build_edge_arrays(edges_data))
+    return engine
+
+
+def _scalar_fold(faces_data, adjacency, min_fold_angle_deg=1.0):
+    """エッジごとに外向き法線の内積を求める比較用の実装"""
+    result = []
+    for adj in adjacency:
+        if len(adj) < 2:
+            result.append(False)
+            continue
+        fa, fb = faces_data[adj[0]], faces_data[adj[1]]
+        if fa["surface_type"] != "plane" or fb["surface_type"] != "plane":
+            result.append(False)
+            continue
+        na = np.array(fa["normal_vector"]) * (-1.0 if fa["reversed"] else 1.0)
+        nb = np.array(fb["normal_vector"]) * (-1.0 if fb["reversed"] else 1.0)
+        result.append(bool(na @ nb < math.cos(math.radians(min_fold_angle_deg))))
+    return np.array(result, dtype=bool)
+
+
+def _cube(reversed_faces):
+    """立方体の6面と12エッジ。reversed_facesの面は平面の軸が内向き（面の向きが反転）"""
+    outward = [(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)]
+    faces = []
+    for i, n in enumerate(outward):
+        is_reversed = i in reversed_faces
+        axis = tuple(-c for c in n) if is_reversed else n
+        faces.append(_plane_face(i, axis, is_reversed))
+    # 向かい合う面（0-1, 2-3, 4-5）以外の組がエッジを共有する
+    adjacency = [(a, b) for a in range(6) for b in range(a + 1, 6) if a // 2 != b // 2]
+    return faces, adjacency
+
+
+def test_edge_arrays():
+    """隣接面リストからint32のface_a/face_b配列が作られるかのテスト"""
+    arrays = build_edge_arrays([
+        {"adjacent_faces": [0, 1]}, {"adjacent_faces": [2]}, {"adjacent_faces": []}
+    ])
+    print(f"エッジ配列テスト: face_a={arrays['face_a'].tolist()}, face_b={arrays['face_b'].tolist()}")
+    assert arrays["face_a"].dtype == np.int32 and arrays["face_b"].dtype == np.int32, "int32配列ではありません"
+    assert arrays["face_a"].tolist() == [0, 2, -1], "face_aが不正です"
+    assert arrays["face_b"].tolist() == [1, -1, -1], "face_bが不正です"
+
+
+def test_cube_all_folds():
+    """立方体の12エッジは、反転面を含んでもすべて折り線になるかのテスト"""
+    for reversed_faces in ((), (1, 3, 5), tuple(range(6))):
+        faces, adjacency = _cube(reversed_faces)
+        is_fold = _engine(faces, adjacency).classify_fold_edges()
+        print(f"立方体テスト（反転面 {reversed_faces}）: 折り線 {int(is_fold.sum())}/12")
+        assert is_fold.all(), f"立方体のエッジが切り取り線と判定されました（反転面 {reversed_faces}）"
+
+
+def test_coplanar_seam_with_reversed_face():
+    """同一平面上の継ぎ目は、片側の面が反転していても折り線にならないかのテスト"""
+    # 外向き法線はどちらも+Z。面1は反転面のため平面の軸は-Zを向く
+    faces = [_plane_face(0, (0, 0, 1)), _plane_face(1, (0, 0, -1), reversed_=True)]
+    is_fold = _engine(faces, [(0, 1)]).classify_fold_edges()
+    print(f"同一平面継ぎ目テスト: {bool(is_fold[0])} (期待値: False)")
+    assert not is_fold[0], "反転面との同一平面上の継ぎ目が折り線と判定されました"
+
+
+def test_curved_and_boundary_edges_excluded():
+    """曲面を含むエッジと境界エッジは折り線にならないかのテスト"""
+    faces = [_plane_face(0, (0, 0, 1)), _cylinder_face(1), _plane_face(2, (1, 0, 0))]
+    is_fold = _engine(faces, [(0, 1), (1, 2), (0,), (0, 2)]).classify_fold_edges()
+    print(f"曲面・境界エッジテスト: {is_fold.tolist()} (期待値: [False, False, False, True])")
+    assert is_fold.tolist() == [False, False, False, True], "曲面・境界エッジの扱いが不正です"
+
+
+def test_matches_scalar():
+    """ランダムな平面・曲面の組み合わせでエッジごとの判定と一致するかのテスト"""
+    rng = np.random.default_rng(0)
+    faces = []
+    for i in range(40):
+        if rng.random() < 0.2:
+            faces.append(_cylinder_face(i))
+            continue
+        normal = rng.normal(size=3)
+        normal /= np.linalg.norm(normal)
+        faces.append(_plane_face(i, normal, reversed_=bool(rng.random() < 0.5)))
+    adjacency = [tuple(rng.choice(40, size=int(rng.integers(1, 3)), replace=False)) for _ in range(200)]
+
+    for angle in (1.0, 30.0):
+        is_fold = _engine(faces, adjacency).classify_fold_edges(min_fold_angle_deg=angle)
+        expected = _scalar_fold(faces, adjacency, min_fold_angle_deg=angle)
+        print(f"比較テスト（閾値 {angle}°）: 折り線 {int(is_fold.sum())}/{len(adjacency)}")
+        assert np.array_equal(is_fold, expected), f"エッジごとの判定と一致しません（閾値 {angle}°）"
+
+
+def main():
+    """全テストを実行"""
+    print("=" * 50)
+    print("折り線判定テスト開始")
+    print("=" * 50)
+
+    try:
+        test_edge_arrays()
+        test_cube_all_folds()
+        test_coplanar_seam_with_reversed_face()
+        test_curved_and_boundary_edges_excluded()
+        test_matches_scalar()
+
+        print("\n" + "=" * 50)
+        print("✅ すべてのテストが成功しました")
+        print("=" * 50)
+
+    except AssertionError as e:
+        print(f"\n❌ テスト失敗: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラー発生: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+幾何解析結果キャッシュ（GeometryCache）のテストケース
+保存・取得・上限超過時の削除・破損ファイル・安全でないディレクトリの扱いを検証
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.geometry_cache import GeometryCache, compute_content_hash
+
+
+def _private_dir() -> str:
+    """テスト用の実行ユーザー専用ディレクトリを作成"""
+    cache_dir = os.path.join(tempfile.mkdtemp(), "cache")
+    os.makedirs(cache_dir, mode=0o700)
+    return cache_dir
+
+
+def test_set_and_get():
+    """保存したエントリが取得できるかのテスト"""
+    cache = GeometryCache(cache_dir=_private_dir())
+    payload = {"faces_data": [{"area": 1.0}], "unfolded_groups": [[1, 2, 3]]}
+    
+    cache.set("key", payload)
+    result = cache.get("key")
+    print(f"保存・取得テスト: {result == payload} (期待値: True)")
+    assert result == payload, "保存したエントリが取得できませんでした"
+    
+    assert cache.get("missing") is None, "存在しないキーでNone以外が返されました"
+
+
+def test_eviction():
+    """上限を超えたとき最終アクセスの古いエントリから削除されるかのテスト"""
+    cache = GeometryCache(cache_dir=_private_dir(), max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    
+    # aにアクセスして最終アクセス時刻をbより新しくする
+    past = time.time() - 100
+    os.utime(cache._entry_path("b"), (past, past))
+    cache.get("a")
+    cache.set("c", {"v": 3})
+    
+    remaining = sorted(os.path.basename(p) for p in cache._list_entries())
+    print(f"削除テスト: {remaining} (期待値: ['a.pkl', 'c.pkl'])")
+    assert remaining == ["a.pkl", "c.pkl"], "最終アクセスの古いエントリが削除されませんでした"
+
+
+def test_corrupt_entry():
+    """破損したキャッシュファイルが破棄されるかのテスト"""
+    cache = GeometryCache(cache_dir=_private_dir())
+    path = cache._entry_path("broken")
+    with open(path, "wb") as f:
+        f.write(b"not a pickle")
+    
+    result = cache.get("broken")
+    print(f"破損ファイルテスト: {result} (期待値: None)")
+    assert result is None, "破損ファイルの内容が返されました"
+    assert not os.path.exists(path), "破損ファイルが削除されませんでした"
+
+
+def test_untrusted_directory():
+    """他ユーザーが書き込めるディレクトリのキャッシュを読まないかのテスト"""
+    cache_dir = _private_dir()
+    cache = GeometryCache(cache_dir=cache_dir)
+    cache.set("key", {"v": 1})
+    
+    os.chmod(cache_dir, 0o777)
+    try:
+        result = cache.get("key")
+        print(f"安全でないディレクトリテスト: {result} (期待値: None)")
+        assert result is None, "他ユーザーが書き込めるディレクトリからキャッシュを読み込みました"
+        
+        cache.set("other", {"v": 2})
+        assert not os.path.exists(cache._entry_path("other")), "安全でないディレクトリに書き込みました"
+    finally:
+        os.chmod(cache_dir, 0o700)
+
+
+def test_content_hash():
+    """内容ハッシュが内容にのみ依存するかのテスト"""
+    assert compute_content_hash(b"ISO-10303-21;") == compute_content_hash(b"ISO-10303-21;")
+    assert compute_content_hash(b"ISO-10303-21;") != compute_content_hash(b"ISO-10303-21; ")
+    print("内容ハッシュテスト: OK")
+
+
+def main():
+    """全テストを実行"""
+    print("=" * 50)
+    print("幾何解析結果キャッシュテスト開始")
+    print("=" * 50)
+    
+    try:
+        test_set_and_get()
+        test_eviction()
+        test_corrupt_entry()
+        if hasattr(os, "getuid"):
+            test_untrusted_directory()
+        test_content_hash()
+        
+        print("\n" + "=" * 50)
+        print("✅ すべてのテストが成功しました")
+        print("=" * 50)
+        
+    except AssertionError as e:
+        print(f"\n❌ テスト失敗: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラー発生: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
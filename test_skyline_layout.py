@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+スカイライン配置（LayoutManager._skyline_position）のテストケース
+占有エリアごとにループする素朴な実装と同じ位置を返し、既存エリアと重ならないかを検証
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.layout_manager import LayoutManager
+
+
+def _scalar_skyline(bbox, occupied_areas, strip_width):
+    """候補X座標ごとに占有エリアを1つずつ調べる比較用の実装"""
+    if not occupied_areas:
+        return {"x": 0, "y": 0}
+
+    x_candidates = sorted({0.0} | {a["max_x"] for a in occupied_areas if a["max_x"] >= 0})
+    fitting = [x for x in x_candidates if x + bbox["width"] <= strip_width]
+    x_candidates = fitting if fitting else x_candidates[:1]
+
+    best = None
+    for x in x_candidates:
+        top = 0.0
+        for area in occupied_areas:
+            # X方向に重なる占有エリアの上端のうち最も高いもの
+            if x + bbox["width"] > area["min_x"] and x < area["max_x"]:
+                top = max(top, area["max_y"])
+        if best is None or top < best["y"]:
+            best = {"x": x, "y": top}
+    return best
+
+
+def _random_areas(rng, count, strip_width):
+    """帯の中に収まるランダムな占有エリアを生成"""
+    areas = []
+    for _ in range(count):
+        width = float(rng.uniform(5, 80))
+        height = float(rng.uniform(5, 80))
+        min_x = float(rng.uniform(0, strip_width - width))
+        min_y = float(rng.uniform(0, 300))
+        areas.append({"min_x": min_x, "min_y": min_y, "max_x": min_x + width, "max_y": min_y + height})
+    return areas
+
+
+def _candidate_area(position, bbox):
+    """配置位置と境界ボックスから候補エリアを作成"""
+    return {
+        "min_x": position["x"], "min_y": position["y"],
+        "max_x": position["x"] + bbox["width"], "max_y": position["y"] + bbox["height"]
+    }
+
+
+def test_empty_layout():
+    """占有エリアがない場合は原点に配置されるかのテスト"""
+    layout_manager = LayoutManager()
+    bbox = {"width": 20.0, "height": 10.0}
+
+    position = layout_manager._skyline_position(bbox, np.empty((0, 4)), 300.0)
+    print(f"空レイアウトテスト: {position} (期待値: {{'x': 0, 'y': 0}})")
+    assert position == {"x": 0, "y": 0}, "占有エリアがないのに原点以外に配置されました"
+
+
+def test_matches_scalar():
+    """ランダムな占有エリアで素朴な実装と同じ位置を返すかのテスト"""
+    layout_manager = LayoutManager()
+    rng = np.random.default_rng(0)
+    strip_width = 300.0
+
+    for trial in range(50):
+        areas = _random_areas(rng, int(rng.integers(1, 30)), strip_width)
+        bbox = {"width": float(rng.uniform(5, 120)), "height": float(rng.uniform(5, 120))}
+
+        expected = _scalar_skyline(bbox, areas, strip_width)
+        # (M, 4)配列と辞書のリストのどちらを渡しても同じ結果になる
+        for occupied in (layout_manager._as_rect_array(areas), areas):
+            position = layout_manager._skyline_position(bbox, occupied, strip_width)
+            assert position == expected, f"素朴な実装と位置が異なります（試行{trial}）: {position} != {expected}"
+    print("スカイライン比較テスト: 50通りの配置で一致")
+
+
+def test_no_overlap_within_strip():
+    """求めた位置が既存エリアと重ならず、帯の幅に収まるかのテスト"""
+    layout_manager = LayoutManager()
+    rng = np.random.default_rng(1)
+    strip_width = 300.0
+
+    for trial in range(50):
+        areas = _random_areas(rng, int(rng.integers(1, 30)), strip_width)
+        bbox = {"width": float(rng.uniform(5, 120)), "height": float(rng.uniform(5, 120))}
+
+        position = layout_manager._skyline_position(bbox, areas, strip_width)
+        candidate = _candidate_area(position, bbox)
+        assert not layout_manager._areas_overlap(candidate, areas), f"既存エリアと重なっています（試行{trial}）"
+        assert candidate["max_x"] <= strip_width, f"帯の幅を超えています（試行{trial}）"
+    print("重複なしテスト: 50通りの配置で重複なし")
+
+
+def test_stacks_on_lowest_column():
+    """最も低い列の上に積まれるかのテスト"""
+    layout_manager = LayoutManager()
+    # 高さの異なる3列（左から高さ100, 40, 70）
+    areas = [
+        {"min_x": 0.0, "min_y": 0.0, "max_x": 100.0, "max_y": 100.0},
+        {"min_x": 100.0, "min_y": 0.0, "max_x": 200.0, "max_y": 40.0},
+        {"min_x": 200.0, "min_y": 0.0, "max_x": 300.0, "max_y": 70.0},
+    ]
+    bbox = {"width": 90.0, "height": 50.0}
+
+    position = layout_manager._skyline_position(bbox, areas, 300.0)
+    print(f"最低列テスト: {position} (期待値: {{'x': 100.0, 'y': 40.0}})")
+    assert position == {"x": 100.0, "y": 40.0}, "最も低い列の上に配置されていません"
+
+
+def test_too_wide_for_strip():
+    """帯より広いグループは左端のスカイライン上に置かれるかのテスト"""
+    layout_manager = LayoutManager()
+    areas = [{"min_x": 0.0, "min_y": 0.0, "max_x": 50.0, "max_y": 30.0}]
+    bbox = {"width": 400.0, "height": 10.0}
+
+    position = layout_manager._skyline_position(bbox, areas, 300.0)
+    print(f"帯超過テスト: {position} (期待値: {{'x': 0.0, 'y': 30.0}})")
+    assert position == {"x": 0.0, "y": 30.0}, "帯より広いグループの配置が不正です"
+
+
+def main():
+    """全テストを実行"""
+    print("=" * 50)
+    print("スカイライン配置テスト開始")
+    print("=" * 50)
+
+    try:
+        test_empty_layout()
+        test_matches_scalar()
+        test_no_overlap_within_strip()
+        test_stacks_on_lowest_column()
+        test_too_wide_for_strip()
+
+        print("\n" + "=" * 50)
+        print("✅ すべてのテストが成功しました")
+        print("=" * 50)
+
+    except AssertionError as e:
+        print(f"\n❌ テスト失敗: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラー発生: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+展開処理の数値計算カーネル（core/unfold_kernels.py）のテストケース
+点ごとにループしていた従来の実装と同じ結果になるかを検証
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.unfold_kernels import (
+    apply_affine_2d, as_points_array, convex_hull_2d, plane_basis, unroll_cone, unroll_cylinder
+)
+
+
+def _scalar_cylinder(points, center, axis, ref_dir, radius):
+    """従来の点ごとの円筒展開（acosと外積の符号で角度を求める）"""
+    points_2d = []
+    for point in points:
+        point_vec = np.array(point) - center
+        y = np.dot(point_vec, axis)
+        radial_vec = point_vec - y * axis
+        radial_dist = np.linalg.norm(radial_vec)
+        if radial_dist > 1e-6:
+            cos_angle = np.clip(np.dot(radial_vec, ref_dir) / radial_dist, -1.0, 1.0)
+            sign = 1 if np.dot(np.cross(ref_dir, radial_vec), axis) >= 0 else -1
+            x = sign * math.acos(cos_angle) * radius
+        else:
+            x = 0.0
+        points_2d.append((x, y))
+    return np.array(points_2d)
+
+
+def _scalar_cone(points, apex, axis, ref_dir, semi_angle):
+    """従来の点ごとの円錐展開"""
+    points_2d = []
+    for point in points:
+        point_vec = np.array(point) - apex
+        distance = np.linalg.norm(point_vec)
+        if distance <= 1e-6:
+            points_2d.append((0.0, 0.0))
+            continue
+        r = np.dot(point_vec, axis)
+        radial_vec = point_vec - r * axis
+        theta = 0.0
+        if abs(semi_angle) > 1e-6 and np.linalg.norm(radial_vec) > 1e-6:
+            theta = math.atan2(np.dot(radial_vec, np.cross(axis, ref_dir)),
+                               np.dot(radial_vec, ref_dir)) * math.sin(semi_angle)
+        points_2d.append((r * math.cos(theta), r * math.sin(theta)))
+    return np.array(points_2d)
+
+
+def _cross_2d(a, b):
+    """2Dベクトルの外積（z成分）"""
+    return a[0] * b[1] - a[1] * b[0]
+
+
+def _axis_frame(axis):
+    """テスト用の単位軸ベクトルと、それに直交する単位基準方向"""
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    ref_dir, _ = plane_basis(axis)
+    return axis, ref_dir
+
+
+def _circle_points(center, axis, ref_dir, radius, angles, heights):
+    """軸周りの角度と軸方向の高さから円筒面上の点を生成"""
+    side_dir = np.cross(axis, ref_dir)
+    return np.array([
+        center + radius * (math.cos(a) * ref_dir + math.sin(a) * side_dir) + h * axis
+        for a, h in zip(angles, heights)
+    ])
+
+
+def test_plane_basis_orthonormal():
+    """plane_basisが法線と右手系の正規直交基底を作るかのテスト"""
+    rng = np.random.default_rng(0)
+    normals = [np.array(n, dtype=np.float64) for n in
+               ([1, 0, 0], [0, 1, 0], [0, 0, 1], [0, 0, -1], [0.9, 0.1, 0.0], [1, 1, 1])]
+    normals += list(rng.normal(size=(20, 3)))
+
+    for normal in normals:
+        normal = normal / np.linalg.norm(normal)
+        u, v = plane_basis(normal)
+        basis = np.vstack((u, v, normal))
+        assert np.allclose(basis @ basis.T, np.eye(3), atol=1e-12), f"正規直交基底になっていません: {normal}"
+        assert np.allclose(np.cross(u, v), normal, atol=1e-12), f"右手系になっていません: {normal}"
+    print(f"plane_basis正規直交性テスト: {len(normals)}個の法線で成功")
+
+
+def test_plane_projection_matches_scalar():
+    """平面投影が従来の点ごとの投影と合同な（回転のみ異なる）形になるかのテスト"""
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        normal = rng.normal(size=3)
+        normal /= np.linalg.norm(normal)
+        origin = rng.uniform(-100, 100, 3)
+        u, v = plane_basis(normal)
+        # 平面上の点群
+        coeffs = rng.uniform(-50, 50, (30, 2))
+        points = origin + coeffs[:, :1] * u + coeffs[:, 1:] * v
+
+        projected = apply_affine_2d(as_points_array(points), np.vstack((u, v)), origin)
+
+        # 従来の実装：法線と|成分|<0.9の座標軸の外積で第1軸を作り、点ごとに内積を取る
+        if abs(normal[0]) < 0.9:
+            old_u = np.cross(normal, [1, 0, 0])
+        elif abs(normal[1]) < 0.9:
+            old_u = np.cross(normal, [0, 1, 0])
+        else:
+            old_u = np.cross(normal, [0, 0, 1])
+        old_u /= np.linalg.norm(old_u)
+        old_v = np.cross(normal, old_u)
+        scalar = np.array([(np.dot(p - origin, old_u), np.dot(p - origin, old_v)) for p in points])
+
+        # 基底の選び方が違うため座標は回転するが、点間距離と向き（符号付き面積）は一致する
+        dist_new = np.linalg.norm(projected[:, None] - projected[None], axis=-1)
+        dist_old = np.linalg.norm(scalar[:, None] - scalar[None], axis=-1)
+        assert np.allclose(dist_new, dist_old, atol=1e-9), "投影後の点間距離が従来と一致しません"
+        area_new = _cross_2d(projected[1] - projected[0], projected[2] - projected[0])
+        area_old = _cross_2d(scalar[1] - scalar[0], scalar[2] - scalar[0])
+        assert math.isclose(area_new, area_old, rel_tol=1e-9, abs_tol=1e-9), "投影後の向きが反転しています"
+    print("平面投影テスト: 従来実装と合同")
+
+
+def test_unroll_cylinder_matches_scalar():
+    """継ぎ目をまたがない円筒境界で従来実装と一致するかのテスト"""
+    axis, ref_dir = _axis_frame([0.2, -0.3, 1.0])
+    center = np.array([5.0, -2.0, 3.0])
+    radius = 12.5
+    angles = np.linspace(-2.5, 2.5, 40)
+    heights = np.linspace(0.0, 30.0, 40)
+    points = _circle_points(center, axis, ref_dir, radius, angles, heights)
+
+    result = unroll_cylinder(points, center, axis, ref_dir, radius)
+    expected = _scalar_cylinder(points, center, axis, ref_dir, radius)
+    error = np.abs(result - expected).max()
+    print(f"円筒展開テスト: 従来実装との最大誤差 {error:.3e}")
+    assert error < 1e-9, "円筒展開が従来実装と一致しません"
+
+
+def test_unroll_cylinder_seam():
+    """±πの継ぎ目をまたぐ円筒境界が途切れずに展開されるかのテスト"""
+    axis, ref_dir = _axis_frame([0.0, 0.0, 1.0])
+    center = np.zeros(3)
+    radius = 10.0
+    # 170°から190°（=-170°）へ継ぎ目をまたいで進む境界
+    angles = np.radians(np.linspace(170.0, 190.0, 21))
+    points = _circle_points(center, axis, ref_dir, radius, angles, np.zeros(21))
+
+    result = unroll_cylinder(points, center, axis, ref_dir, radius)
+    expected = _scalar_cylinder(points, center, axis, ref_dir, radius)
+
+    # 従来実装は継ぎ目で約2πrだけ飛ぶ。新実装は隣接点間隔が弧長のまま連続する
+    step = radius * math.radians(1.0)
+    assert np.allclose(np.diff(result[:, 0]), step, atol=1e-9), "継ぎ目で展開座標が途切れています"
+    assert np.abs(np.diff(expected[:, 0])).max() > math.pi * radius, "比較用の従来実装が継ぎ目で飛んでいません"
+    # 周方向は2πrの整数倍の差を除いて従来実装と同じ位置
+    wrapped = np.remainder(result[:, 0] - expected[:, 0] + math.pi * radius, 2 * math.pi * radius) - math.pi * radius
+    assert np.allclose(wrapped, 0.0, atol=1e-9), "継ぎ目以外で従来実装と位置が異なります"
+    assert np.allclose(result[:, 1], expected[:, 1], atol=1e-12), "軸方向座標が従来実装と一致しません"
+    print(f"円筒継ぎ目テスト: 展開幅 {np.ptp(result[:, 0]):.3f} (期待値: {radius * math.radians(20.0):.3f})")
+
+
+def test_unroll_cylinder_axis_points():
+    """軸上の点（半径0）は角度0として扱われるかのテスト"""
+    axis, ref_dir = _axis_frame([0.0, 1.0, 0.0])
+    center = np.zeros(3)
+    points = np.vstack((_circle_points(center, axis, ref_dir, 5.0, [0.3, 0.6], [0.0, 1.0]),
+                        [[0.0, 2.0, 0.0]]))
+
+    result = unroll_cylinder(points, center, axis, ref_dir, 5.0)
+    expected = _scalar_cylinder(points, center, axis, ref_dir, 5.0)
+    print(f"円筒軸上点テスト: {result[-1].tolist()} (期待値: {expected[-1].tolist()})")
+    assert np.allclose(result, expected, atol=1e-9), "軸上の点の扱いが従来実装と一致しません"
+
+
+def test_unroll_cone_matches_scalar():
+    """継ぎ目をまたがない円錐境界と頂点上の点で従来実装と一致するかのテスト"""
+    axis, ref_dir = _axis_frame([1.0, 0.5, -0.2])
+    apex = np.array([1.0, 2.0, 3.0])
+    semi_angle = math.radians(25.0)
+    heights = np.linspace(5.0, 40.0, 30)
+    angles = np.linspace(-2.0, 2.0, 30)
+    points = _circle_points(apex, axis, ref_dir, 1.0, angles, heights)
+    # 円錐面上に載るよう半径を高さに比例させる
+    radial = points - apex - np.outer(heights, axis)
+    points = apex + np.outer(heights, axis) + radial * (heights * math.tan(semi_angle))[:, None]
+    points = np.vstack((points, apex))
+
+    result = unroll_cone(points, apex, axis, ref_dir, semi_angle)
+    expected = _scalar_cone(points, apex, axis, ref_dir, semi_angle)
+    error = np.abs(result - expected).max()
+    print(f"円錐展開テスト: 従来実装との最大誤差 {error:.3e}")
+    assert error < 1e-9, "円錐展開が従来実装と一致しません"
+
+
+def test_unroll_cone_seam():
+    """±πの継ぎ目をまたぐ円錐境界が扇形として連続するかのテスト"""
+    axis, ref_dir = _axis_frame([0.0, 0.0, 1.0])
+    apex = np.zeros(3)
+    semi_angle = math.radians(30.0)
+    height = 20.0
+    angles = np.radians(np.linspace(160.0, 200.0, 41))
+    points = _circle_points(apex, axis, ref_dir, height * math.tan(semi_angle), angles, np.full(41, height))
+
+    result = unroll_cone(points, apex, axis, ref_dir, semi_angle)
+    expected = _scalar_cone(points, apex, axis, ref_dir, semi_angle)
+
+    # 展開後も頂点からの距離は一定で、扇形の角度は単調に増える
+    radii = np.linalg.norm(result, axis=1)
+    fan_angles = np.unwrap(np.arctan2(result[:, 1], result[:, 0]))
+    assert np.allclose(radii, height, atol=1e-9), "展開後の半径が一定ではありません"
+    assert np.all(np.diff(fan_angles) > 0), "継ぎ目で扇形の角度が逆戻りしています"
+    # 継ぎ目の手前（180°未満）は従来実装と一致する
+    before_seam = np.degrees(angles) < 180.0
+    assert np.allclose(result[before_seam], expected[before_seam], atol=1e-9), "継ぎ目以前が従来実装と一致しません"
+    print(f"円錐継ぎ目テスト: 扇形角度の幅 {math.degrees(np.ptp(fan_angles)):.3f}° "
+          f"(期待値: {40.0 * math.sin(semi_angle):.3f}°)")
+
+
+def test_convex_hull_matches_qhull():
+    """凸包が従来のscipy（Qhull）と同じ頂点集合・反時計回りになるかのテスト"""
+    from scipy.spatial import ConvexHull
+
+    rng = np.random.default_rng(2)
+    for trial in range(20):
+        points = rng.uniform(-100, 100, (rng.integers(3, 80), 2))
+        hull = convex_hull_2d(points)
+        expected = ConvexHull(points).vertices
+
+        assert set(hull.tolist()) == set(expected.tolist()), f"凸包の頂点がQhullと一致しません（試行{trial}）"
+        ring = points[hull]
+        signed_area = np.sum(ring[:, 0] * np.roll(ring[:, 1], -1) - np.roll(ring[:, 0], -1) * ring[:, 1])
+        assert signed_area > 0, f"凸包が反時計回りではありません（試行{trial}）"
+    print("凸包テスト: 20通りの点群でQhullと一致")
+
+
+def test_convex_hull_collinear_and_degenerate():
+    """辺上の共線点を除き、一直線の点群ではValueErrorになるかのテスト"""
+    # 正方形の辺上に点を並べた境界（従来はQhullが角の4点のみを返していた）
+    edge = np.linspace(0.0, 10.0, 11)
+    square = np.vstack([
+        np.column_stack((edge, np.zeros(11))),
+        np.column_stack((np.full(11, 10.0), edge)),
+        np.column_stack((edge[::-1], np.full(11, 10.0))),
+        np.column_stack((np.zeros(11), edge[::-1])),
+    ])
+    hull = convex_hull_2d(square)
+    corners = {tuple(p) for p in square[hull].tolist()}
+    print(f"共線点テスト: 凸包頂点数 {len(hull)} (期待値: 4)")
+    assert corners == {(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)}, "辺上の点が凸包頂点に残っています"
+
+    for degenerate in (np.array([[0.0, 0.0], [1.0, 1.0]]),
+                       np.column_stack((np.arange(5.0), np.arange(5.0) * 2.0))):
+        try:
+            convex_hull_2d(degenerate)
+        except ValueError:
+            continue
+        raise AssertionError("退化した点群でValueErrorが発生しませんでした")
+    print("退化点群テスト: ValueErrorを確認")
+
+
+def main():
+    """全テストを実行"""
+    print("=" * 50)
+    print("展開カーネルテスト開始")
+    print("=" * 50)
+
+    try:
+        test_plane_basis_orthonormal()
+        test_plane_projection_matches_scalar()
+        test_unroll_cylinder_matches_scalar()
+        test_unroll_cylinder_seam()
+        test_unroll_cylinder_axis_points()
+        test_unroll_cone_matches_scalar()
+        test_unroll_cone_seam()
+        test_convex_hull_matches_qhull()
+        test_convex_hull_collinear_and_degenerate()
+
+        print("\n" + "=" * 50)
+        print("✅ すべてのテストが成功しました")
+        print("=" * 50)
+
+    except AssertionError as e:
+        print(f"\n❌ テスト失敗: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラー発生: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+点群間の距離計算。
+面重心などの小〜中規模な点群では、scipyのcdistを読み込む初期化コストの方が
+計算そのものより大きくなるため、NumPyの行列演算だけで二乗距離を求める。
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def pairwise_sqdist(A: np.ndarray, B: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    2つの点群間の二乗ユークリッド距離行列を計算する。
+    |a-b|^2 = |a|^2 + |b|^2 - 2a·b の展開により、(N, M, D)の中間配列を作らない。
+    展開式は原点から遠い点群で桁落ちするため、先にAの平均を両方の点群から引いて原点付近へ移す。
+
+    Args:
+        A: (N, D)の点配列
+        B: (M, D)の点配列（省略時はAとの自己距離）
+
+    Returns:
+        np.ndarray: (N, M)の二乗距離行列
+    """
+    A = np.asarray(A, dtype=np.float64)
+    center = A.mean(axis=0) if len(A) else np.zeros(A.shape[1:])
+    same = B is None
+    # 平行移動しても距離は変わらないため、共通の中心を引いてから展開式を使う
+    A = np.ascontiguousarray(A - center)
+    B = A if same else np.ascontiguousarray(np.asarray(B, dtype=np.float64) - center)
+
+    sq_a = np.einsum("ij,ij->i", A, A)
+    sq_b = sq_a if same else np.einsum("ij,ij->i", B, B)
+    out = A @ B.T
+    out *= -2.0
+    out += sq_a[:, None]
+    out += sq_b[None, :]
+
+    # 桁落ちによる負の微小値を0に丸める
+    np.maximum(out, 0.0, out=out)
+    if same:
+        np.fill_diagonal(out, 0.0)
+    return out
@@ -0,0 +1,163 @@
+"""
+幾何解析〜面展開結果のディスクキャッシュ。
+同一ファイルの再アップロード時（レイアウト・表示パラメータのみ変更）に
+OCCTトポロジ解析と展開処理を省略するために使用する。
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import stat
+import tempfile
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# キャッシュ内容の形式バージョン。展開処理の結果やキャッシュする配列の構成が変わる変更を入れたら上げる
+CACHE_FORMAT_VERSION = 2
+
+
+def compute_content_hash(content: bytes) -> str:
+    """
+    ファイル内容からキャッシュキー用のハッシュ値を計算する。
+
+    Args:
+        content: ファイルのバイト列
+
+    Returns:
+        str: 16進数ハッシュ文字列
+    """
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class GeometryCache:
+    """
+    展開結果をpickleでディスクに保存するLRUキャッシュ。
+    エントリ数が上限を超えた場合は最終アクセスの古い順に削除する。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 64):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（省略時は実行ユーザー専用の ~/.cache/unfold-step2svg）
+            max_entries: 保持する最大エントリ数
+        """
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".cache", "unfold-step2svg")
+        self.max_entries = max_entries
+
+    def _is_trusted_dir(self) -> bool:
+        """
+        キャッシュディレクトリが実行ユーザーの所有で、他ユーザーから書き込めないかを確認する。
+        pickleは読み込み時に任意のコードを実行できるため、他人が置いたファイルは読まない。
+
+        Returns:
+            bool: 安全に読み書きできる場合True
+        """
+        try:
+            st = os.lstat(self.cache_dir)
+        except FileNotFoundError:
+            return False
+        if not stat.S_ISDIR(st.st_mode):
+            return False
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            return False
+        return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _ensure_dir(self) -> bool:
+        """
+        キャッシュディレクトリを作成し、安全に使えるかを確認する。
+
+        Returns:
+            bool: 使用できる場合True
+        """
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        if not self._is_trusted_dir():
+            logger.warning("キャッシュディレクトリの所有者または権限が不正なため使用しません: %s", self.cache_dir)
+            return False
+        return True
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュからエントリを取得する。
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            保存済みの辞書。存在しない・破損している場合None
+        """
+        if not self._is_trusted_dir():
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("キャッシュ読み込みエラー（破棄します）: %s", e)
+            self._remove(path)
+            return None
+
+        # LRU判定用に最終アクセス時刻を更新
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return payload
+
+    def set(self, key: str, payload: Dict[str, Any]) -> None:
+        """
+        エントリをキャッシュに保存する。書き込みは一時ファイル経由で原子的に行う。
+
+        Args:
+            key: キャッシュキー
+            payload: 保存する辞書（pickle可能であること）
+        """
+        temp_path = None
+        try:
+            if not self._ensure_dir():
+                return
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception as e:
+            logger.warning("キャッシュ書き込みエラー: %s", e)
+            if temp_path:
+                self._remove(temp_path)
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        """キャッシュを全削除する"""
+        for path in self._list_entries():
+            self._remove(path)
+
+    def _list_entries(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.cache_dir, n) for n in names if n.endswith(".pkl")]
+
+    def _evict(self) -> None:
+        """上限を超えたエントリを最終アクセスの古い順に削除"""
+        entries = self._list_entries()
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0.0)
+        for path in entries[:len(entries) - self.max_entries]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass